@@ -0,0 +1,370 @@
+"""
+Fenwick trees (binary indexed trees) for prefix sums over flat typed arrays.
+
+https://en.wikipedia.org/wiki/Fenwick_tree
+https://cp-algorithms.com/data_structures/fenwick.html
+
+maximum_fenwick_tree.MaxFenwickTree answers range maxima and is filled by n
+separate updates.  The trees here keep sums, which have an inverse, so a range is
+the difference of two prefixes and every operation is a plain O(log n) walk:
+
+* ``FenwickTree``: point add, prefix and range sums, ``lower_bound`` on the
+  prefix sums, and ``add_many`` for batches;
+* ``RangeFenwickTree``: add to a whole range and sum a range, using two trees
+  over the differences of the values (the dual-tree trick);
+* ``FenwickTree2D``: point add and rectangle sums on a grid.
+
+All of them build from existing values in O(n) by pushing each node into its
+parent once instead of making n updates, and store node i (1-indexed) in an
+``array.array`` of C long longs by default, 8 bytes per bucket, or doubles with
+``typecode="d"``.
+
+>>> tree = FenwickTree([3, 1, 4, 1, 5, 9, 2, 6])
+>>> tree.prefix(4), tree.query(2, 6)
+(9, 19)
+>>> tree.add(3, 10)
+>>> tree.query(2, 6), tree.lower_bound(9)
+(29, 3)
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable, Sequence
+from timeit import timeit
+
+
+def _build(tree: array, n: int) -> None:
+    """Turn values at 1 .. n into Fenwick nodes in place: each adds into its parent."""
+    for i in range(1, n + 1):
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+
+
+class FenwickTree:
+    """
+    Prefix sums over size values, all zero unless arr is given.
+
+    >>> FenwickTree(size=4).get_array()
+    [0, 0, 0, 0]
+    >>> tree = FenwickTree([0.5, 1.5, 2.0], typecode="d")
+    >>> tree.prefix(3), tree.get(1)
+    (4.0, 1.5)
+    >>> FenwickTree()
+    Traceback (most recent call last):
+        ...
+    ValueError: Either arr or size must be specified
+    """
+
+    def __init__(
+        self,
+        arr: Iterable[float] | None = None,
+        size: int | None = None,
+        typecode: str = "q",
+    ) -> None:
+        if arr is None and size is None:
+            raise ValueError("Either arr or size must be specified")
+        if arr is None:
+            self.size = size or 0
+            self.tree = array(typecode, [0]) * (self.size + 1)
+        else:
+            self.tree = array(typecode, [0])
+            self.tree.extend(arr)
+            self.size = len(self.tree) - 1
+            _build(self.tree, self.size)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def get_array(self) -> list[float]:
+        """
+        The values, recovered in O(n) by undoing the construction.
+
+        >>> FenwickTree([5, -2, 7, 0, 3]).get_array()
+        [5, -2, 7, 0, 3]
+        """
+        values = self.tree[:]
+        for i in range(self.size, 0, -1):
+            parent = i + (i & -i)
+            if parent <= self.size:
+                values[parent] -= values[i]
+        return values.tolist()[1:]
+
+    def add(self, index: int, value: float) -> None:
+        """
+        arr[index] += value in O(log n).
+
+        >>> FenwickTree(size=3).add(3, 1)
+        Traceback (most recent call last):
+            ...
+        IndexError: array index out of range
+        """
+        tree, n = self.tree, self.size
+        if not 0 <= index < n:
+            raise IndexError("array index out of range")
+        index += 1
+        while index <= n:
+            tree[index] += value
+            index += index & -index
+
+    def add_many(self, updates: Iterable[tuple[int, float]]) -> None:
+        """
+        arr[index] += value for every pair.  A batch of k updates costs
+        O(k log n) one by one; past n / log2(n) updates the deltas are gathered
+        and pushed up the tree in one O(n + k) pass instead.
+
+        >>> tree = FenwickTree(size=4)
+        >>> tree.add_many([(0, 1), (2, 5), (0, 2)])
+        >>> tree.get_array()
+        [3, 0, 5, 0]
+        >>> tree.add_many([(3, 1)] * 10)
+        >>> tree.get_array()
+        [3, 0, 5, 10]
+        """
+        updates = updates if isinstance(updates, list) else list(updates)
+        n = self.size
+        if len(updates) * n.bit_length() <= n:
+            add = self.add
+            for index, value in updates:
+                add(index, value)
+            return
+        deltas = array(self.tree.typecode, [0]) * (n + 1)
+        for index, value in updates:
+            if not 0 <= index < n:
+                raise IndexError("array index out of range")
+            deltas[index + 1] += value
+        _build(deltas, n)
+        tree = self.tree
+        for i in range(1, n + 1):
+            tree[i] += deltas[i]
+
+    def update(self, index: int, value: float) -> None:
+        """
+        arr[index] = value.
+
+        >>> tree = FenwickTree([1, 2, 3])
+        >>> tree.update(1, 10)
+        >>> tree.get_array()
+        [1, 10, 3]
+        """
+        self.add(index, value - self.get(index))
+
+    def prefix(self, right: int) -> float:
+        """
+        Sum of arr[0:right] in O(log n).
+
+        >>> tree = FenwickTree([1, 2, 3, 4])
+        >>> [tree.prefix(right) for right in range(5)]
+        [0, 1, 3, 6, 10]
+        """
+        tree = self.tree
+        result = tree[0]  # zero of the right type
+        while right > 0:
+            result += tree[right]
+            right -= right & -right
+        return result
+
+    def query(self, left: int, right: int) -> float:
+        """Sum of arr[left:right]."""
+        return self.prefix(right) - self.prefix(left)
+
+    def get(self, index: int) -> float:
+        return self.query(index, index + 1)
+
+    def lower_bound(self, value: float) -> int:
+        """
+        Smallest index with prefix(index + 1) >= value, or len(self) if there is
+        none, by descending the implicit tree in O(log n).  The values must not be
+        negative, so that the prefix sums never decrease.
+
+        >>> tree = FenwickTree([2, 0, 3, 1])
+        >>> [tree.lower_bound(value) for value in (0, 1, 2, 3, 5, 6, 7)]
+        [0, 0, 0, 2, 2, 3, 4]
+        """
+        tree, n = self.tree, self.size
+        position = 0
+        step = 1 << n.bit_length()
+        while step:
+            # position is an index whose prefix is still below value
+            if position + step <= n and tree[position + step] < value:
+                position += step
+                value -= tree[position]
+            step >>= 1
+        return position
+
+
+class RangeFenwickTree:
+    """
+    Range add and range sum.  With d[i] = arr[i] - arr[i - 1], the prefix sum
+    arr[0] + ... + arr[p - 1] is p * sum(d[i]) - sum(i * d[i]) over i < p, so one
+    tree holds d and the other i * d, and adding to arr[left:right] changes d in
+    two places only.
+
+    >>> tree = RangeFenwickTree([1, 2, 3, 4, 5])
+    >>> tree.add(1, 4, 10)
+    >>> tree.query(0, 5), tree.query(3, 5), tree.get(3)
+    (45, 19, 14)
+    >>> [tree.get(i) for i in range(5)]
+    [1, 12, 13, 14, 5]
+    """
+
+    def __init__(
+        self,
+        arr: Sequence[float] | None = None,
+        size: int | None = None,
+        typecode: str = "q",
+    ) -> None:
+        if arr is None:
+            if size is None:
+                raise ValueError("Either arr or size must be specified")
+            arr = [0] * size
+        differences = [arr[0]] if arr else []
+        differences += [arr[i] - arr[i - 1] for i in range(1, len(arr))]
+        self.differences = FenwickTree(differences, typecode=typecode)
+        self.weighted = FenwickTree(
+            [i * d for i, d in enumerate(differences)], typecode=typecode
+        )
+        self.size = len(differences)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, left: int, right: int, value: float) -> None:
+        """arr[i] += value for every i in left .. right - 1."""
+        if left >= right:
+            return
+        self.differences.add(left, value)
+        self.weighted.add(left, left * value)
+        if right < self.size:
+            self.differences.add(right, -value)
+            self.weighted.add(right, -right * value)
+
+    def prefix(self, right: int) -> float:
+        """Sum of arr[0:right]."""
+        return right * self.differences.prefix(right) - self.weighted.prefix(right)
+
+    def query(self, left: int, right: int) -> float:
+        """Sum of arr[left:right]."""
+        return self.prefix(right) - self.prefix(left)
+
+    def get(self, index: int) -> float:
+        return self.differences.prefix(index + 1)
+
+
+class FenwickTree2D:
+    """
+    Point add and rectangle sums on a rows x columns grid, in O(log rows *
+    log columns).  Node (i, j) lives at i * (columns + 1) + j of one flat array.
+
+    >>> grid = FenwickTree2D([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    >>> grid.prefix(2, 2), grid.query(1, 1, 3, 3)
+    (12, 28)
+    >>> grid.add(1, 1, 100)
+    >>> grid.query(0, 0, 3, 3), grid.query(1, 0, 2, 3)
+    (145, 115)
+    >>> FenwickTree2D(rows=2, columns=5).query(0, 0, 2, 5)
+    0
+    """
+
+    def __init__(
+        self,
+        grid: Sequence[Sequence[float]] | None = None,
+        rows: int | None = None,
+        columns: int | None = None,
+        typecode: str = "q",
+    ) -> None:
+        if grid is not None:
+            rows, columns = len(grid), len(grid[0]) if grid else 0
+        if rows is None or columns is None:
+            raise ValueError("Either grid or rows and columns must be specified")
+        self.rows, self.columns = rows, columns
+        width = columns + 1
+        self.tree = tree = array(typecode, [0]) * ((rows + 1) * width)
+        if grid is None:
+            return
+        for i, row in enumerate(grid, 1):
+            tree[i * width + 1 : (i + 1) * width] = array(typecode, row)
+        # the 1D construction along every row, then along every column
+        for i in range(1, rows + 1):
+            base = i * width
+            for j in range(1, columns + 1):
+                parent = j + (j & -j)
+                if parent <= columns:
+                    tree[base + parent] += tree[base + j]
+        for i in range(1, rows + 1):
+            parent = i + (i & -i)
+            if parent <= rows:
+                for j in range(1, columns + 1):
+                    tree[parent * width + j] += tree[i * width + j]
+
+    def add(self, row: int, column: int, value: float) -> None:
+        """grid[row][column] += value."""
+        tree, width = self.tree, self.columns + 1
+        i = row + 1
+        while i <= self.rows:
+            j = column + 1
+            while j <= self.columns:
+                tree[i * width + j] += value
+                j += j & -j
+            i += i & -i
+
+    def prefix(self, rows: int, columns: int) -> float:
+        """Sum of grid[r][c] over r < rows and c < columns."""
+        tree, width = self.tree, self.columns + 1
+        result = tree[0]
+        i = rows
+        while i > 0:
+            j = columns
+            while j > 0:
+                result += tree[i * width + j]
+                j -= j & -j
+            i -= i & -i
+        return result
+
+    def query(self, top: int, left: int, bottom: int, right: int) -> float:
+        """Sum of grid[r][c] over top <= r < bottom and left <= c < right."""
+        return (
+            self.prefix(bottom, right)
+            - self.prefix(top, right)
+            - self.prefix(bottom, left)
+            + self.prefix(top, left)
+        )
+
+
+def benchmark(
+    size: int = 1_000_000, num_updates: int = 1_000_000
+) -> dict[str, float]:
+    """
+    Seconds to build a FenwickTree over size counters from an array and by size
+    single adds, and to apply num_updates random increments with add_many and
+    with add one at a time.  Raises AssertionError if the trees disagree.
+
+    >>> sorted(benchmark(100, 300))
+    ['add', 'add_many', 'build', 'build by adds']
+    """
+    rng = random.Random(0)
+    counters = [rng.randrange(1000) for _ in range(size)]
+    updates = [(rng.randrange(size), rng.randrange(-5, 6)) for _ in range(num_updates)]
+
+    def by_adds() -> FenwickTree:
+        tree = FenwickTree(size=size)
+        for index, value in enumerate(counters):
+            tree.add(index, value)
+        return tree
+
+    def one_by_one(tree: FenwickTree) -> None:
+        for index, value in updates:
+            tree.add(index, value)
+
+    built, added = FenwickTree(counters), by_adds()
+    assert built.tree == added.tree
+    built.add_many(updates)
+    one_by_one(added)
+    assert built.tree == added.tree
+    return {
+        "build": timeit(lambda: FenwickTree(counters), number=1),
+        "build by adds": timeit(by_adds, number=1),
+        "add_many": timeit(lambda: built.add_many(updates), number=1),
+        "add": timeit(lambda: one_by_one(added), number=1),
+    }
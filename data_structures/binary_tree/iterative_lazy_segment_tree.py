@@ -0,0 +1,300 @@
+"""
+A bottom-up lazy segment tree for any monoid and any family of range updates.
+
+https://codeforces.com/blog/entry/18051 (modification on interval)
+https://atcoder.github.io/ac-library/production/document_en/lazysegtree.html
+
+lazy_segment_tree.SegmentTree only does range assign with max queries, recurses in
+build, update and query and allocates three lists of 4n entries.  Here the tree
+over n values is the usual iterative one: node i has children 2i and 2i + 1 and
+value i sits at node n + i, so there are 2n values plus n pending updates, built
+bottom up in O(n).  The operations are parameters:
+
+* values form a monoid: ``op`` is associative with identity ``identity``;
+* updates are functions on values: ``mapping(f, x, length)`` applies update f to
+  the value x of a node covering length values, ``composition(f, g)`` is the
+  update "g, then f", and ``no_update`` changes nothing.
+
+Before an update or query touches a range, the pending updates on the paths from
+the root to its two ends are pushed down; after an update those paths are
+recombined, so both cost O(log n) and nothing recurses.  ``range_add_sum``,
+``range_assign_min``, ``range_assign_max`` and ``range_affine_sum`` build the
+common trees.
+
+>>> tree = range_add_sum([5, 1, 4, 2, 3])
+>>> tree.update(1, 3, 10)
+>>> tree.query(0, 4), tree.query(2, 2), tree.to_list()
+(45, 14, [5, 11, 14, 12, 3])
+>>> tree = range_affine_sum([1, 2, 3])
+>>> tree.update(0, 1, (2, 1))  # x -> 2x + 1
+>>> tree.query(0, 2), tree.to_list()
+(11, [3, 5, 3])
+"""
+from __future__ import annotations
+
+import operator
+import random
+from collections.abc import Callable, Iterable
+from math import inf
+from timeit import timeit
+from typing import Any
+
+
+class LazySegmentTree:
+    """
+    >>> concat = LazySegmentTree(
+    ...     "abcde", operator.add, "", lambda f, x, length: f * length if f else x,
+    ...     lambda f, g: f or g, "",
+    ... )
+    >>> concat.update(1, 2, "z")
+    >>> concat.query(0, 4), concat.query(2, 3), concat.query(3, 2)
+    ('azzde', 'zd', '')
+    >>> len(concat)
+    5
+    """
+
+    def __init__(
+        self,
+        arr: Iterable[Any],
+        op: Callable[[Any, Any], Any],
+        identity: Any,
+        mapping: Callable[[Any, Any, int], Any],
+        composition: Callable[[Any, Any], Any],
+        no_update: Any,
+    ) -> None:
+        leaves = list(arr)
+        self.size = n = len(leaves)
+        self.height = n.bit_length()
+        self.op, self.identity = op, identity
+        self.mapping, self.composition, self.no_update = mapping, composition, no_update
+        self.value = [identity] * n + leaves
+        for i in range(n - 1, 0, -1):
+            self.value[i] = op(self.value[2 * i], self.value[2 * i + 1])
+        self.pending = [no_update] * n  # updates not yet passed to the children
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _apply(self, node: int, f: Any, length: int) -> None:
+        self.value[node] = self.mapping(f, self.value[node], length)
+        if node < self.size:
+            self.pending[node] = self.composition(f, self.pending[node])
+
+    def _push(self, node: int, shift: int) -> None:
+        """Pass the pending update of node, 2**shift values wide, to its children."""
+        value, pending = self.value, self.pending
+        f = pending[node]
+        if f == self.no_update:
+            return
+        half = 1 << (shift - 1)
+        left, right = 2 * node, 2 * node + 1
+        value[left] = self.mapping(f, value[left], half)
+        value[right] = self.mapping(f, value[right], half)
+        if left < self.size:
+            pending[left] = self.composition(f, pending[left])
+            pending[right] = self.composition(f, pending[right])
+        pending[node] = self.no_update
+
+    def _push_borders(self, left: int, right: int) -> None:
+        """
+        Push down, top first, along the paths to the leaves left and right - 1.  An
+        ancestor whose subtree starts at left (or ends before right) is skipped: it
+        lies inside the range, so the range never reaches below it.
+        """
+        pending, no_update = self.pending, self.no_update
+        for shift in range(self.height, 0, -1):
+            node = left >> shift
+            if node << shift != left and pending[node] != no_update:
+                self._push(node, shift)
+            node = (right - 1) >> shift
+            if (right >> shift) << shift != right and pending[node] != no_update:
+                self._push(node, shift)
+
+    def _pull_borders(self, left: int, right: int) -> None:
+        """Recombine, bottom first, the ancestors that _push_borders pushed."""
+        value, op = self.value, self.op
+        for shift in range(1, self.height + 1):
+            if (left >> shift) << shift != left:
+                node = left >> shift
+                value[node] = op(value[2 * node], value[2 * node + 1])
+            if (right >> shift) << shift != right:
+                node = (right - 1) >> shift
+                value[node] = op(value[2 * node], value[2 * node + 1])
+
+    def update(self, left: int, right: int, f: Any) -> None:
+        """
+        Apply update f to every value in arr[left .. right], both ends included.
+
+        >>> tree = range_assign_min([7, 3, 9, 4, 8, 6])
+        >>> tree.update(0, 2, 5)
+        >>> tree.update(2, 4, 1)
+        >>> tree.query(0, 1), tree.query(0, 5), tree.to_list()
+        (5, 1, [5, 5, 1, 1, 1, 6])
+        """
+        if left > right:
+            return
+        left += self.size
+        right += self.size + 1
+        self._push_borders(left, right)
+        first, end = left, right
+        length = 1
+        while left < right:
+            if left & 1:
+                self._apply(left, f, length)
+                left += 1
+            if right & 1:
+                right -= 1
+                self._apply(right, f, length)
+            left >>= 1
+            right >>= 1
+            length <<= 1
+        self._pull_borders(first, end)
+
+    def query(self, left: int, right: int) -> Any:
+        """
+        Combination of arr[left .. right], both ends included, in order; the
+        identity when the range is empty.
+
+        >>> tree = range_assign_max([1, 2, -4, 7, 3, -5, 6, 11, -20, 9, 14, 15])
+        >>> tree.query(3, 5), tree.query(6, 10), tree.query(6, 11)
+        (7, 14, 15)
+        """
+        if left > right:
+            return self.identity
+        left += self.size
+        right += self.size + 1
+        self._push_borders(left, right)
+        value, op = self.value, self.op
+        left_value = right_value = self.identity
+        while left < right:
+            if left & 1:
+                left_value = op(left_value, value[left])
+                left += 1
+            if right & 1:
+                right -= 1
+                right_value = op(value[right], right_value)
+            left >>= 1
+            right >>= 1
+        return op(left_value, right_value)
+
+    def to_list(self) -> list[Any]:
+        """All n values, after pushing every pending update down in O(n)."""
+        pending, no_update = self.pending, self.no_update
+        # a parent comes before its children, so updates travel top down
+        for node in range(1, self.size):
+            if pending[node] != no_update:
+                leaf = node
+                while leaf < self.size:
+                    leaf *= 2
+                self._push(node, leaf.bit_length() - node.bit_length())
+        return self.value[self.size :]
+
+
+def range_add_sum(arr: Iterable[int | float]) -> LazySegmentTree:
+    """update(left, right, c) adds c to each value, query returns the sum."""
+    return LazySegmentTree(
+        arr,
+        operator.add,
+        0,
+        lambda f, x, length: x + f * length,
+        operator.add,
+        0,
+    )
+
+
+def range_add_min(arr: Iterable[int | float]) -> LazySegmentTree:
+    """
+    update(left, right, c) adds c to each value, query returns the minimum.
+
+    >>> tree = range_add_min([4, 6, 5])
+    >>> tree.update(0, 1, 3)
+    >>> tree.query(0, 2), tree.query(0, 1)
+    (5, 7)
+    """
+    return LazySegmentTree(
+        arr, min, inf, lambda f, x, length: x + f, operator.add, 0
+    )
+
+
+def _assign(f: Any, x: Any, length: int) -> Any:
+    return x if f is None else f
+
+
+def _assign_after(f: Any, g: Any) -> Any:
+    return g if f is None else f
+
+
+def range_assign_min(arr: Iterable[int | float]) -> LazySegmentTree:
+    """update(left, right, c) sets each value to c, query returns the minimum."""
+    return LazySegmentTree(arr, min, inf, _assign, _assign_after, None)
+
+
+def range_assign_max(arr: Iterable[int | float]) -> LazySegmentTree:
+    """update(left, right, c) sets each value to c, query returns the maximum."""
+    return LazySegmentTree(arr, max, -inf, _assign, _assign_after, None)
+
+
+def range_affine_sum(arr: Iterable[int | float]) -> LazySegmentTree:
+    """
+    update(left, right, (a, b)) maps each value x to a * x + b, query returns the
+    sum.  Range add is (1, c) and range assign is (0, c).
+
+    >>> tree = range_affine_sum([1, 2, 3, 4])
+    >>> tree.update(0, 3, (1, 10))
+    >>> tree.update(2, 3, (0, 1))
+    >>> tree.update(1, 2, (3, 0))
+    >>> tree.to_list(), tree.query(0, 3)
+    ([11, 36, 3, 1], 51)
+    """
+    return LazySegmentTree(
+        arr,
+        operator.add,
+        0,
+        lambda f, x, length: f[0] * x + f[1] * length,
+        lambda f, g: (f[0] * g[0], f[0] * g[1] + f[1]),
+        (1, 0),
+    )
+
+
+def benchmark(size: int = 100_000, num_operations: int = 100_000) -> dict[str, float]:
+    """
+    Seconds for num_operations random range assigns, each followed by a range max
+    query, with range_assign_max and with lazy_segment_tree.SegmentTree.  Raises
+    AssertionError if the answers disagree.
+
+    >>> sorted(benchmark(50, 20))
+    ['SegmentTree', 'range_assign_max']
+    """
+    from data_structures.binary_tree.lazy_segment_tree import SegmentTree
+
+    rng = random.Random(0)
+    values = [rng.randrange(10**9) for _ in range(size)]
+    operations = []
+    for _ in range(num_operations):
+        left, right = sorted((rng.randrange(size), rng.randrange(size)))
+        query = sorted((rng.randrange(size), rng.randrange(size)))
+        operations.append((left, right, rng.randrange(10**9), *query))
+
+    def iterative() -> list[int]:
+        tree = range_assign_max(values)
+        answers = []
+        for left, right, value, query_left, query_right in operations:
+            tree.update(left, right, value)
+            answers.append(tree.query(query_left, query_right))
+        return answers
+
+    def recursive() -> list[int]:
+        # the old tree is 1-indexed
+        tree = SegmentTree(size)
+        tree.build(1, 1, size, values)
+        answers = []
+        for left, right, value, query_left, query_right in operations:
+            tree.update(1, 1, size, left + 1, right + 1, value)
+            answers.append(tree.query(1, 1, size, query_left + 1, query_right + 1))
+        return answers
+
+    assert iterative() == recursive()
+    return {
+        "range_assign_max": timeit(iterative, number=1),
+        "SegmentTree": timeit(recursive, number=1),
+    }
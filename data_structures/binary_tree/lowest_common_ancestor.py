@@ -41,16 +41,16 @@ def lowest_common_ancestor(
     # u must be deeper in the tree than v
     if level[u] < level[v]:
         u, v = swap(u, v)
-    # making depth of u same as depth of v
-    for i in range(18, -1, -1):
+    # making depth of u same as depth of v, one row of the table per power of two
+    for i in range(len(parent) - 1, -1, -1):
         if level[u] - (1 << i) >= level[v]:
             u = parent[i][u]
     # at the same depth if u==v that mean lca is found
     if u == v:
         return u
     # moving both nodes upwards till lca in found
-    for i in range(18, -1, -1):
-        if parent[i][u] not in [0, parent[i][v]]:
+    for i in range(len(parent) - 1, -1, -1):
+        if parent[i][u] != 0 and parent[i][u] != parent[i][v]:
             u, v = parent[i][u], parent[i][v]
     # returning longest common ancestor of u,v
     return parent[0][u]
@@ -0,0 +1,265 @@
+"""
+Lowest common ancestors in O(1) per query after O(n log n) preprocessing, and
+offline in one pass with Tarjan's algorithm.
+
+https://en.wikipedia.org/wiki/Lowest_common_ancestor#Reduction_to_RMQ
+https://en.wikipedia.org/wiki/Tarjan%27s_off-line_lowest_common_ancestors_algorithm
+
+lowest_common_ancestor.py climbs a binary lifting table in O(log n) per query.
+``LowestCommonAncestor`` reduces the problem to a range minimum over the depth
+first order instead (the Euler tour with one entry per vertex): for u != v
+visited at times tin[u] < tin[v], the lowest common ancestor is the parent of
+least depth among the vertices visited at times tin[u] + 1 .. tin[v].  A sparse
+table answers that minimum with two lookups.  Every entry packs (depth, vertex)
+into one integer, so the rows are ``array.array`` objects built by ``map(min,
+...)`` over the row below and a query is one ``min`` of two integers.
+
+``offline_lca`` answers a whole batch of pairs in one depth first pass over the
+tree with an ``ArrayDisjointSet``, O((n + q) alpha(n)), without any table.
+
+Trees are given as n - 1 edges over the vertices 0 .. n - 1; nothing recurses.
+
+>>> edges = [(0, 1), (0, 2), (1, 3), (1, 4), (2, 5), (4, 6)]
+>>> lca = LowestCommonAncestor(7, edges)
+>>> lca.query(3, 6), lca.query(6, 5), lca.query(4, 4), lca.depth[6]
+(1, 0, 4, 3)
+>>> offline_lca(7, edges, [(3, 6), (6, 5), (4, 4)])
+[1, 0, 4]
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable
+from timeit import timeit
+
+from data_structures.disjoint_set.array_disjoint_set import ArrayDisjointSet
+
+
+def _adjacency(num_nodes: int, edges: Iterable[tuple[int, int]]) -> tuple[array, array]:
+    """indptr and neighbors of the undirected tree, checking it has n - 1 edges."""
+    edges = edges if isinstance(edges, list) else list(edges)
+    if len(edges) != max(num_nodes - 1, 0):
+        raise ValueError(f"a tree on {num_nodes} nodes has {num_nodes - 1} edges")
+    indptr = array("l", [0]) * (num_nodes + 1)
+    for u, v in edges:
+        indptr[u + 1] += 1
+        indptr[v + 1] += 1
+    for u in range(num_nodes):
+        indptr[u + 1] += indptr[u]
+    neighbors = array("l", [0]) * (2 * len(edges))
+    fill = indptr[:-1]
+    for u, v in edges:
+        neighbors[fill[u]] = v
+        fill[u] += 1
+        neighbors[fill[v]] = u
+        fill[v] += 1
+    return indptr, neighbors
+
+
+def _depth_first_order(
+    num_nodes: int, indptr: array, neighbors: array, root: int
+) -> tuple[list[int], array, array]:
+    """Preorder, parent (-1 at the root) and depth, or ValueError if disconnected."""
+    parent = array("l", [-1]) * num_nodes
+    depth = array("l", [-1]) * num_nodes
+    depth[root] = 0
+    order = []
+    stack = [root]
+    while stack:
+        u = stack.pop()
+        order.append(u)
+        for v in neighbors[indptr[u] : indptr[u + 1]]:
+            if depth[v] == -1:
+                parent[v] = u
+                depth[v] = depth[u] + 1
+                stack.append(v)
+    if len(order) != num_nodes:
+        raise ValueError("the edges do not connect all nodes")
+    return order, parent, depth
+
+
+class LowestCommonAncestor:
+    """
+    >>> lca = LowestCommonAncestor(5, [(3, 0), (3, 1), (1, 2), (1, 4)], root=3)
+    >>> lca.query_many([(0, 2), (2, 4), (4, 1), (3, 3)])
+    [3, 1, 1, 3]
+    >>> lca.parent.tolist(), [len(row) for row in lca.table]
+    ([3, 3, 1, -1, 1], [4, 3, 1])
+    >>> LowestCommonAncestor(4, [(0, 1), (2, 3), (1, 0)])
+    Traceback (most recent call last):
+        ...
+    ValueError: the edges do not connect all nodes
+    """
+
+    def __init__(
+        self, num_nodes: int, edges: Iterable[tuple[int, int]], root: int = 0
+    ) -> None:
+        indptr, neighbors = _adjacency(num_nodes, edges)
+        order, self.parent, self.depth = _depth_first_order(
+            num_nodes, indptr, neighbors, root
+        )
+        self.tin = array("l", [0]) * num_nodes
+        for time, u in enumerate(order):
+            self.tin[u] = time
+        shift = num_nodes.bit_length()
+        self.mask = (1 << shift) - 1
+        # entry i: (depth, vertex) of the parent of the vertex visited at time i + 1
+        row = array(
+            "q",
+            (self.depth[p] << shift | p for p in map(self.parent.__getitem__, order)),
+        )[1:]
+        self.table = [row]
+        width, size = 1, len(row)
+        while 2 * width <= size:
+            row = array("q", map(min, row[:-width], row[width:]))
+            self.table.append(row)
+            width *= 2
+
+    def query(self, u: int, v: int) -> int:
+        if u == v:
+            return u
+        left, right = self.tin[u], self.tin[v]
+        if left > right:
+            left, right = right, left
+        level = (right - left).bit_length() - 1
+        row = self.table[level]
+        return min(row[left], row[right - (1 << level)]) & self.mask
+
+    def query_many(self, pairs: Iterable[tuple[int, int]]) -> list[int]:
+        tin, table, mask = self.tin, self.table, self.mask
+        answers = []
+        for u, v in pairs:
+            left, right = tin[u], tin[v]
+            if left > right:
+                left, right = right, left
+            elif left == right:
+                answers.append(u)
+                continue
+            level = (right - left).bit_length() - 1
+            row = table[level]
+            answers.append(min(row[left], row[right - (1 << level)]) & mask)
+        return answers
+
+
+def offline_lca(
+    num_nodes: int,
+    edges: Iterable[tuple[int, int]],
+    pairs: Iterable[tuple[int, int]],
+    root: int = 0,
+) -> list[int]:
+    """
+    Tarjan's offline algorithm.  In postorder, each finished vertex is merged into
+    its parent's set, whose ``ancestor`` is then the parent; the answer for a pair
+    is ready when the second of its ends finishes: the ancestor of the set holding
+    the first.
+
+    >>> edges = [(0, 1), (1, 2), (1, 3), (3, 4), (0, 5)]
+    >>> offline_lca(6, edges, [(2, 4), (4, 5), (3, 3), (4, 1), (2, 4)])
+    [1, 0, 3, 1, 1]
+    >>> offline_lca(6, edges, [(2, 4), (2, 5)], root=4)
+    [4, 1]
+    >>> offline_lca(4, [(1, 2), (2, 3), (3, 1)], [(1, 2)], root=1)
+    Traceback (most recent call last):
+        ...
+    ValueError: the edges do not connect all nodes
+    """
+    indptr, neighbors = _adjacency(num_nodes, edges)
+    pairs = pairs if isinstance(pairs, list) else list(pairs)
+    # the pairs touching each vertex, grouped like the adjacency arrays
+    start = array("l", [0]) * (num_nodes + 1)
+    for u, v in pairs:
+        start[u + 1] += 1
+        start[v + 1] += 1
+    for u in range(num_nodes):
+        start[u + 1] += start[u]
+    pair_ids = array("l", [0]) * (2 * len(pairs))
+    fill = start[:-1]
+    for pair_id, (u, v) in enumerate(pairs):
+        pair_ids[fill[u]] = pair_id
+        fill[u] += 1
+        pair_ids[fill[v]] = pair_id
+        fill[v] += 1
+
+    sets = ArrayDisjointSet(num_nodes)
+    ancestor = array("l", range(num_nodes))
+    parent = array("l", [-1]) * num_nodes
+    seen, finished = bytearray(num_nodes), bytearray(num_nodes)
+    pointer = indptr[:-1]
+    answers = [-1] * len(pairs)
+    seen[root] = 1
+    stack = [root]
+    while stack:
+        u = stack[-1]
+        if pointer[u] < indptr[u + 1]:
+            v = neighbors[pointer[u]]
+            pointer[u] += 1
+            if not seen[v]:
+                seen[v] = 1
+                parent[v] = u
+                stack.append(v)
+            continue
+        stack.pop()
+        finished[u] = 1
+        for pair_id in pair_ids[start[u] : start[u + 1]]:
+            first, second = pairs[pair_id]
+            other = second if first == u else first
+            if finished[other]:
+                answers[pair_id] = ancestor[sets.find(other)]
+        if parent[u] != -1:
+            sets.union(parent[u], u)
+            ancestor[sets.find(u)] = parent[u]
+    if not all(finished):
+        raise ValueError("the edges do not connect all nodes")
+    return answers
+
+
+def _random_tree(num_nodes: int, seed: int) -> list[tuple[int, int]]:
+    rng = random.Random(seed)
+    return [(rng.randrange(v), v) for v in range(1, num_nodes)]
+
+
+def benchmark(num_nodes: int = 100_000, num_pairs: int = 200_000) -> dict[str, float]:
+    """
+    Seconds to answer num_pairs random queries on a random tree: preprocessing
+    included, with the sparse table, with offline_lca and with the binary lifting
+    of lowest_common_ancestor.py.  Raises AssertionError if they disagree.
+
+    >>> sorted(benchmark(200, 100))
+    ['binary lifting', 'offline_lca', 'sparse table']
+    """
+    from data_structures.binary_tree import lowest_common_ancestor as lifting
+
+    edges = _random_tree(num_nodes, 0)
+    rng = random.Random(1)
+    pairs = [
+        (rng.randrange(num_nodes), rng.randrange(num_nodes)) for _ in range(num_pairs)
+    ]
+
+    def sparse_table() -> list[int]:
+        return LowestCommonAncestor(num_nodes, edges).query_many(pairs)
+
+    def binary_lifting() -> list[int]:
+        # the old module numbers nodes from 1 and uses 0 as "no parent"
+        graph: dict[int, list[int]] = {v: [] for v in range(1, num_nodes + 1)}
+        for u, v in edges:
+            graph[u + 1].append(v + 1)
+            graph[v + 1].append(u + 1)
+        levels = max(1, num_nodes.bit_length())
+        level = [-1] * (num_nodes + 1)
+        parent = [[0] * (num_nodes + 1) for _ in range(levels)]
+        level, parent = lifting.breadth_first_search(level, parent, num_nodes, graph)
+        parent = lifting.create_sparse(num_nodes, parent)
+        return [
+            lifting.lowest_common_ancestor(u + 1, v + 1, level, parent) - 1
+            for u, v in pairs
+        ]
+
+    variants = {
+        "sparse table": sparse_table,
+        "offline_lca": lambda: offline_lca(num_nodes, edges, pairs),
+        "binary lifting": binary_lifting,
+    }
+    answers = [run() for run in variants.values()]
+    assert answers[0] == answers[1] == answers[2]
+    return {name: timeit(run, number=1) for name, run in variants.items()}
@@ -0,0 +1,265 @@
+"""
+Wavelet matrix: rank, quantile and range counting over an integer array, stored as
+one packed bit-vector per bit of the values.
+
+https://doi.org/10.1016/j.is.2014.06.002 (Claude, Navarro, Ordonez: The wavelet
+matrix)
+
+wavelet_tree.build_tree copies the values into two new lists at every node and
+keeps map_left as a list of Python ints, O(n log sigma) boxed integers of about
+28 bytes each.  A wavelet matrix answers the same queries with one level per bit
+of the largest value: level k stores bit k (from the top) of every value, in the
+order the levels above left them, as a ``BitVector`` of 64-bit words plus one
+running popcount per word.  Each level is built from the previous order with a
+stable partition by ``itertools.compress``, zeros first, and nothing else is
+kept, so the matrix takes about 2 bits per element per level.  Rank inside a
+level is a lookup and a popcount, O(1), so every query is O(log sigma).
+
+Values are stored relative to the minimum, so negative numbers work.  The query
+methods take inclusive intervals like the functions of wavelet_tree.py.
+
+>>> matrix = WaveletMatrix([2, 1, 4, 5, 6, 0, 8, 9, 1, 2, 0, 6, 4, 2, 0, 6, 5, 3])
+>>> matrix.rank(6, 3, 13), matrix.quantile(5, 2, 13)
+(2, 4)
+>>> matrix.range_counting(1, 10, 3, 7)
+3
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Iterable
+from itertools import accumulate, compress, repeat
+from operator import and_, rshift
+from timeit import timeit
+
+# bytes of 0 and 1 -> ASCII digits, and 0 <-> 1
+_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+_FLIP = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+
+def _typecode(largest: int) -> str:
+    """The smallest unsigned array type that holds 0 .. largest."""
+    for typecode in "BHIQ":
+        if largest < 1 << (8 * array(typecode).itemsize):
+            return typecode
+    raise OverflowError("values span more than 64 bits")
+
+
+class BitVector:
+    """
+    Bits packed 64 to a word, with the number of ones before each word, so that
+    rank1 is a lookup plus one popcount.
+
+    >>> bits = BitVector(bytes([1, 0, 1, 1, 0] * 30))
+    >>> len(bits), bits.rank1(5), bits.rank1(150), bits.rank0(150), bits[2]
+    (150, 3, 90, 60, 1)
+    """
+
+    def __init__(self, bits: bytes) -> None:
+        """bits holds one byte, 0 or 1, per position."""
+        self.size = len(bits)
+        digits = bits.translate(_DIGITS)
+        # position i is bit i % 64 of word i // 64; one spare word for rank1(size)
+        self.words = array(
+            "Q",
+            (
+                int(digits[start : start + 64][::-1], 2)
+                for start in range(0, len(digits), 64)
+            ),
+        )
+        self.words.append(0)
+        self.ranks = array(
+            "Q", accumulate((word.bit_count() for word in self.words), initial=0)
+        )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        return self.words[index >> 6] >> (index & 63) & 1
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.itemsize * (len(self.words) + len(self.ranks))
+
+    def rank1(self, end: int) -> int:
+        """Number of ones at positions 0 .. end - 1."""
+        word = end >> 6
+        return self.ranks[word] + (
+            self.words[word] & ((1 << (end & 63)) - 1)
+        ).bit_count()
+
+    def rank0(self, end: int) -> int:
+        """Number of zeros at positions 0 .. end - 1."""
+        word = end >> 6
+        return (
+            end
+            - self.ranks[word]
+            - (self.words[word] & ((1 << (end & 63)) - 1)).bit_count()
+        )
+
+
+class WaveletMatrix:
+    """
+    >>> matrix = WaveletMatrix([-3, 7, -3, 0, 12, 7])
+    >>> matrix.height, len(matrix.levels), matrix.zeros
+    (4, 4, [3, 5, 2, 4])
+    >>> [matrix.quantile(k, 0, 5) for k in range(6)]
+    [-3, -3, 0, 7, 7, 12]
+    >>> matrix.rank(7, 0, 5), matrix.rank(8, 0, 5), matrix.rank(-3, 1, 1)
+    (2, 0, 0)
+    >>> WaveletMatrix([]).quantile(0, 0, 0)
+    -1
+    """
+
+    def __init__(self, arr: Iterable[int]) -> None:
+        values = array("q", arr)
+        self.size = len(values)
+        self.minimum = min(values) if values else 0
+        largest = (max(values) if values else 0) - self.minimum
+        self.height = largest.bit_length()
+        current = array(
+            _typecode(largest), (value - self.minimum for value in values)
+        )
+        del values
+        self.levels: list[BitVector] = []
+        self.zeros: list[int] = []
+        for bit in range(self.height - 1, -1, -1):
+            bits = bytes(map(and_, map(rshift, current, repeat(bit)), repeat(1)))
+            zeros = bits.translate(_FLIP)
+            self.levels.append(BitVector(bits))
+            # stable partition: values with a 0 at this bit first
+            following = array(current.typecode, compress(current, zeros))
+            self.zeros.append(len(following))
+            following.extend(compress(current, bits))
+            current = following
+
+    def __len__(self) -> int:
+        return self.size
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self.levels)
+
+    def rank_till_index(self, num: int, index: int) -> int:
+        """
+        Occurrences of num in arr[0 .. index].
+
+        >>> matrix = WaveletMatrix([2, 1, 4, 5, 6, 0, 8, 9, 1, 2, 0])
+        >>> matrix.rank_till_index(1, 10), matrix.rank_till_index(17, 7)
+        (2, 0)
+        """
+        return self.rank(num, 0, index)
+
+    def rank(self, num: int, start: int, end: int) -> int:
+        """Occurrences of num in arr[start .. end]."""
+        value = num - self.minimum
+        if start > end or value < 0 or value >> self.height:
+            return 0
+        end += 1
+        for level, zeros, bit in zip(
+            self.levels, self.zeros, range(self.height - 1, -1, -1)
+        ):
+            start_zeros, end_zeros = level.rank0(start), level.rank0(end)
+            if value >> bit & 1:
+                start = zeros + start - start_zeros
+                end = zeros + end - end_zeros
+            else:
+                start, end = start_zeros, end_zeros
+        return end - start
+
+    def quantile(self, index: int, start: int, end: int) -> int:
+        """
+        The index'th smallest value of arr[start .. end], counting from 0, or -1
+        when the interval has no such element.
+        """
+        if not 0 <= index <= end - start or start < 0 or end >= self.size:
+            return -1
+        end += 1
+        value = 0
+        for level, zeros in zip(self.levels, self.zeros):
+            start_zeros, end_zeros = level.rank0(start), level.rank0(end)
+            in_range = end_zeros - start_zeros
+            value <<= 1
+            if index < in_range:
+                start, end = start_zeros, end_zeros
+            else:
+                index -= in_range
+                value |= 1
+                start = zeros + start - start_zeros
+                end = zeros + end - end_zeros
+        return value + self.minimum
+
+    def _count_less(self, start: int, end: int, bound: int) -> int:
+        """Values below minimum + bound in arr[start:end]."""
+        if bound <= 0:
+            return 0
+        if bound >> self.height:
+            return end - start
+        count = 0
+        for level, zeros, bit in zip(
+            self.levels, self.zeros, range(self.height - 1, -1, -1)
+        ):
+            start_zeros, end_zeros = level.rank0(start), level.rank0(end)
+            if bound >> bit & 1:
+                # everything with a 0 here is below bound
+                count += end_zeros - start_zeros
+                start = zeros + start - start_zeros
+                end = zeros + end - end_zeros
+            else:
+                start, end = start_zeros, end_zeros
+        return count
+
+    def range_counting(
+        self, start: int, end: int, start_num: int, end_num: int
+    ) -> int:
+        """
+        Number of values of arr[start .. end] within start_num .. end_num.
+
+        >>> matrix = WaveletMatrix([2, 1, 4, 5, 6, 0, 8, 9, 1, 2, 0, 6, 4, 2, 0])
+        >>> matrix.range_counting(2, 2, 1, 4), matrix.range_counting(0, 14, 0, 100)
+        (1, 15)
+        >>> matrix.range_counting(1, 0, 1, 100), matrix.range_counting(0, 14, 100, 1)
+        (0, 0)
+        """
+        if start > end or start_num > end_num:
+            return 0
+        end += 1
+        return self._count_less(
+            start, end, end_num + 1 - self.minimum
+        ) - self._count_less(start, end, start_num - self.minimum)
+
+
+def benchmark(size: int = 200_000, num_queries: int = 20_000) -> dict[str, float]:
+    """
+    Seconds to build a WaveletMatrix and a wavelet_tree over size random values
+    below 2**16, and to answer num_queries random quantile queries with each.
+    Raises AssertionError if the answers disagree.
+
+    >>> sorted(benchmark(300, 50))
+    ['WaveletMatrix build', 'WaveletMatrix quantile', 'build_tree', 'quantile']
+    """
+    from data_structures.binary_tree import wavelet_tree
+
+    rng = random.Random(0)
+    values = [rng.randrange(1 << 16) for _ in range(size)]
+    queries = []
+    for _ in range(num_queries):
+        start, end = sorted((rng.randrange(size), rng.randrange(size)))
+        queries.append((rng.randrange(end - start + 1), start, end))
+    matrix = WaveletMatrix(values)
+    root = wavelet_tree.build_tree(values)
+    answers = [matrix.quantile(*query) for query in queries]
+    assert answers == [wavelet_tree.quantile(root, *query) for query in queries]
+    return {
+        "WaveletMatrix build": timeit(lambda: WaveletMatrix(values), number=1),
+        "build_tree": timeit(lambda: wavelet_tree.build_tree(values), number=1),
+        "WaveletMatrix quantile": timeit(
+            lambda: [matrix.quantile(*query) for query in queries], number=1
+        ),
+        "quantile": timeit(
+            lambda: [wavelet_tree.quantile(root, *query) for query in queries],
+            number=1,
+        ),
+    }
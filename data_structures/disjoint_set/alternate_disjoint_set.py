@@ -8,14 +8,32 @@ class DisjointSet:
     def __init__(self, set_counts: list) -> None:
         """
         Initialize with a list of the number of items in each set
-        and with rank = 1 for each set
+        and with rank = 1 for each set; the list may be empty
+        >>> DisjointSet([]).max_set
+        0
         """
         self.set_counts = set_counts
-        self.max_set = max(set_counts)
+        self.max_set = max(set_counts, default=0)
         num_sets = len(set_counts)
         self.ranks = [1] * num_sets
         self.parents = list(range(num_sets))
 
+    def add_sets(self, set_counts: list) -> range:
+        """
+        Append new sets with the given numbers of items and return their ids
+        >>> A = DisjointSet([])
+        >>> A.add_sets([1, 3])
+        range(0, 2)
+        >>> A.add_sets([2]), A.max_set, A.get_parent(2)
+        (range(2, 3), 3, 2)
+        """
+        start = len(self.parents)
+        self.set_counts.extend(set_counts)
+        self.ranks.extend([1] * len(set_counts))
+        self.parents.extend(range(start, start + len(set_counts)))
+        self.max_set = max([self.max_set, *set_counts])
+        return range(start, len(self.parents))
+
     def merge(self, src: int, dst: int) -> bool:
         """
         Merge two sets together using Union by rank heuristic
@@ -62,7 +80,11 @@ class DisjointSet:
         >>> A.get_parent(1)
         2
         """
-        if self.parents[disj_set] == disj_set:
-            return disj_set
-        self.parents[disj_set] = self.get_parent(self.parents[disj_set])
-        return self.parents[disj_set]
+        parents = self.parents
+        root = disj_set
+        while parents[root] != root:
+            root = parents[root]
+        # Path compression without recursion: point every node on the path at root.
+        while parents[disj_set] != root:
+            parents[disj_set], disj_set = root, parents[disj_set]
+        return root
@@ -43,9 +43,11 @@ def find_set(x: Node) -> Node:
     """
     Return the parent of x
     """
-    if x != x.parent:
-        x.parent = find_set(x.parent)
-    return x.parent
+    # Iterative path halving, so long chains cannot hit the recursion limit.
+    while x != x.parent:
+        x.parent = x.parent.parent
+        x = x.parent
+    return x
 
 
 def find_python_set(node: Node) -> set:
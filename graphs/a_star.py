@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import heapq
+from collections.abc import Callable
+
 DIRECTIONS = [
     [-1, 0],  # left
     [0, -1],  # down
@@ -8,67 +11,106 @@ DIRECTIONS = [
 ]
 
 
+def manhattan_heuristic(goal: list[int]) -> Callable[[int, int], int]:
+    """
+    Heuristic computed on demand: Manhattan distance from a cell to goal.
+
+    >>> manhattan_heuristic([4, 5])(1, 1)
+    7
+    """
+    goal_x, goal_y = goal[0], goal[1]
+
+    def heuristic(x: int, y: int) -> int:
+        return abs(x - goal_x) + abs(y - goal_y)
+
+    return heuristic
+
+
 # function to search the path
 def search(
     grid: list[list[int]],
     init: list[int],
     goal: list[int],
     cost: int,
-    heuristic: list[list[int]],
+    heuristic: list[list[int]] | Callable[[int, int], int] | None = None,
 ) -> tuple[list[list[int]], list[list[int]]]:
-    closed = [
-        [0 for col in range(len(grid[0]))] for row in range(len(grid))
-    ]  # the reference grid
-    closed[init[0]][init[1]] = 1
-    action = [
-        [0 for col in range(len(grid[0]))] for row in range(len(grid))
-    ]  # the action grid
-
-    x = init[0]
-    y = init[1]
-    g = 0
-    f = g + heuristic[x][y]  # cost from starting cell to destination cell
-    cell = [[f, g, x, y]]
+    """
+    A* from init to goal on a grid where 0 is free and anything else is blocked.
 
-    found = False  # flag that is set when search is complete
-    resign = False  # flag set if we can't find expand
+    The open list is a binary heap of (f, g, x, y) tuples, so cells are expanded in
+    the same order as sorting the whole list before each pop, at O(log n) per pop.
+    Closed cells and the action that reached every cell are kept in flat byte
+    arrays.  heuristic may be the classic precomputed matrix, a callable
+    heuristic(x, y) evaluated only for the cells that are reached, or None for the
+    Manhattan distance to goal.
 
-    while not found and not resign:
-        if len(cell) == 0:
+    >>> grid = [
+    ...     [0, 1, 0, 0, 0, 0],
+    ...     [0, 1, 0, 0, 0, 0],
+    ...     [0, 1, 0, 0, 0, 0],
+    ...     [0, 1, 0, 0, 1, 0],
+    ...     [0, 0, 0, 0, 1, 0],
+    ... ]
+    >>> path, action = search(grid, [0, 0], [4, 5], 1)
+    >>> path  # doctest: +NORMALIZE_WHITESPACE
+    [[0, 0], [1, 0], [2, 0], [3, 0], [4, 0], [4, 1], [4, 2], [4, 3], [3, 3],
+     [2, 3], [2, 4], [2, 5], [3, 5], [4, 5]]
+    >>> matrix = [[abs(i - 4) + abs(j - 5) for j in range(6)] for i in range(5)]
+    >>> search(grid, [0, 0], [4, 5], 1, matrix) == (path, action)
+    True
+    >>> search([[0, 1], [1, 0]], [0, 0], [1, 1], 1)
+    Traceback (most recent call last):
+        ...
+    ValueError: Algorithm is unable to find solution
+    """
+    rows, cols = len(grid), len(grid[0])
+    if heuristic is None:
+        heuristic = manhattan_heuristic(goal)
+    if callable(heuristic):
+        estimate = heuristic
+    else:
+        matrix = heuristic
+
+        def estimate(x: int, y: int) -> int:
+            return matrix[x][y]
+
+    closed = bytearray(rows * cols)  # the reference grid, one byte per cell
+    action = bytearray(rows * cols)  # index into DIRECTIONS that reached a cell
+    x, y = init[0], init[1]
+    closed[x * cols + y] = 1
+
+    g = 0
+    f = g + estimate(x, y)  # cost from starting cell to destination cell
+    cell = [(f, g, x, y)]
+
+    goal_x, goal_y = goal[0], goal[1]
+    moves = list(enumerate((dx, dy) for dx, dy in DIRECTIONS))
+    while True:
+        if not cell:
             raise ValueError("Algorithm is unable to find solution")
-        else:  # to choose the least costliest action so as to move closer to the goal
-            cell.sort()
-            cell.reverse()
-            next_cell = cell.pop()
-            x = next_cell[2]
-            y = next_cell[3]
-            g = next_cell[1]
-
-            if x == goal[0] and y == goal[1]:
-                found = True
-            else:
-                for i in range(len(DIRECTIONS)):  # to try out different valid actions
-                    x2 = x + DIRECTIONS[i][0]
-                    y2 = y + DIRECTIONS[i][1]
-                    if x2 >= 0 and x2 < len(grid) and y2 >= 0 and y2 < len(grid[0]):
-                        if closed[x2][y2] == 0 and grid[x2][y2] == 0:
-                            g2 = g + cost
-                            f2 = g2 + heuristic[x2][y2]
-                            cell.append([f2, g2, x2, y2])
-                            closed[x2][y2] = 1
-                            action[x2][y2] = i
-    invpath = []
-    x = goal[0]
-    y = goal[1]
-    invpath.append([x, y])  # we get the reverse path from here
+        # the least costly open cell is always at the top of the heap
+        f, g, x, y = heapq.heappop(cell)
+        if x == goal_x and y == goal_y:
+            break
+        g2 = g + cost
+        for i, (dx, dy) in moves:  # to try out different valid actions
+            x2 = x + dx
+            y2 = y + dy
+            if 0 <= x2 < rows and 0 <= y2 < cols:
+                index = x2 * cols + y2
+                if closed[index] == 0 and grid[x2][y2] == 0:
+                    heapq.heappush(cell, (g2 + estimate(x2, y2), g2, x2, y2))
+                    closed[index] = 1
+                    action[index] = i
+
+    invpath = [[goal_x, goal_y]]  # we get the reverse path from here
+    x, y = goal_x, goal_y
     while x != init[0] or y != init[1]:
-        x2 = x - DIRECTIONS[action[x][y]][0]
-        y2 = y - DIRECTIONS[action[x][y]][1]
-        x = x2
-        y = y2
+        dx, dy = DIRECTIONS[action[x * cols + y]]
+        x -= dx
+        y -= dy
         invpath.append([x, y])
+    invpath.reverse()
 
-    path = []
-    for i in range(len(invpath)):
-        path.append(invpath[len(invpath) - 1 - i])
-    return path, action
\ No newline at end of file
+    action_grid = [list(action[row * cols : (row + 1) * cols]) for row in range(rows)]
+    return invpath, action_grid
@@ -3,7 +3,11 @@ https://en.wikipedia.org/wiki/Bidirectional_search
 """
 from __future__ import annotations
 
+import sys
 import time
+from array import array
+from collections.abc import Iterable, Iterator
+from heapq import heappop, heappush
 from math import sqrt
 
 # 1 for manhattan, 0 for euclidean
@@ -236,4 +240,153 @@ class BidirectionalAStar:
         bwd_path.pop()
         bwd_path.reverse()
         path = fwd_path + bwd_path
-        return path
\ No newline at end of file
+        return path
+
+
+class BidirectionalAStarContext:
+    """
+    Reusable bidirectional A* for many queries on the same static grid.
+
+    The grid is copied once into a walkable bitmap with a one cell wall border, so
+    the four neighbours of a cell are fixed index offsets and need no bounds checks.
+    Cost, parent and visit buffers are allocated once and tagged with a query
+    number instead of being cleared, so a query only touches the cells it visits.
+    Moves cost 1 and both searches use the Manhattan distance, which keeps the
+    returned paths shortest.  Like AStar.search an unreachable goal yields
+    [start].
+
+    >>> context = BidirectionalAStarContext(grid)
+    >>> path = context.search((0, 0), (len(grid) - 1, len(grid[0]) - 1))
+    >>> len(path) - 1, path[0], path[-1]
+    (12, (0, 0), (6, 6))
+    >>> all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+    True
+    >>> list(context.search_many([((0, 0), (0, 3)), ((2, 1), (2, 1))]))
+    [[(0, 0), (0, 1), (0, 2), (0, 3)], [(2, 1)]]
+    >>> BidirectionalAStarContext([[0, 1], [1, 0]]).search((0, 0), (1, 1))
+    [(0, 0)]
+    >>> context.search((1, 1), (0, 0))
+    Traceback (most recent call last):
+        ...
+    ValueError: (1, 1) is not a free cell of the grid
+    """
+
+    def __init__(self, grid: list[list[int]]) -> None:
+        self.height = len(grid)
+        self.width = len(grid[0])
+        stride = self.width + 2
+        size = (self.height + 2) * stride
+        self.stride = stride
+        self.walkable = bytearray(size)
+        for row, cells in enumerate(grid):
+            base = (row + 1) * stride + 1
+            for col, cell in enumerate(cells):
+                if cell == 0:
+                    self.walkable[base + col] = 1
+        # up, left, down, right, in the order of delta
+        self.offsets = (-stride, -1, stride, 1)
+        self.row_of = array("l", (index // stride for index in range(size)))
+        self.col_of = array("l", (index % stride for index in range(size)))
+
+        self.query = 0
+        self.cost = (array("l", [0]) * size, array("l", [0]) * size)
+        self.parent = (array("l", [-1]) * size, array("l", [-1]) * size)
+        self.seen = (array("l", [0]) * size, array("l", [0]) * size)
+
+    def _index(self, position: TPosition) -> int:
+        row, col = position
+        index = (row + 1) * self.stride + col + 1
+        if not (0 <= row < self.height and 0 <= col < self.width) or (
+            not self.walkable[index]
+        ):
+            raise ValueError(f"{position} is not a free cell of the grid")
+        return index
+
+    def _position(self, index: int) -> TPosition:
+        return (self.row_of[index] - 1, self.col_of[index] - 1)
+
+    def search(self, start: TPosition, goal: TPosition) -> list[TPosition]:
+        source, target = self._index(start), self._index(goal)
+        if source == target:
+            return [start]
+        self.query += 1
+        query = self.query
+        walkable, offsets = self.walkable, self.offsets
+        row_of, col_of = self.row_of, self.col_of
+
+        heaps: tuple[list, list] = ([], [])
+        for side, (root, towards) in enumerate(((source, target), (target, source))):
+            self.cost[side][root] = 0
+            self.parent[side][root] = -1
+            self.seen[side][root] = query
+            estimate = abs(row_of[root] - row_of[towards])
+            estimate += abs(col_of[root] - col_of[towards])
+            heaps[side].append((estimate, 0, root))
+
+        best, meeting = sys.maxsize, -1
+        while heaps[0] and heaps[1]:
+            # Every undiscovered path costs at least the smallest f on either side.
+            if max(heaps[0][0][0], heaps[1][0][0]) >= best:
+                break
+            side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+            heap = heaps[side]
+            cost, parent, seen = self.cost[side], self.parent[side], self.seen[side]
+            other_cost, other_seen = self.cost[1 - side], self.seen[1 - side]
+            towards = target if side == 0 else source
+            towards_row, towards_col = row_of[towards], col_of[towards]
+
+            _, g_cost, current = heappop(heap)
+            if g_cost != cost[current]:
+                continue  # stale entry, the cell was reached more cheaply since
+            g_next = g_cost + 1
+            for offset in offsets:
+                neighbour = current + offset
+                if not walkable[neighbour]:
+                    continue
+                if seen[neighbour] == query and cost[neighbour] <= g_next:
+                    continue
+                seen[neighbour] = query
+                cost[neighbour] = g_next
+                parent[neighbour] = current
+                estimate = abs(row_of[neighbour] - towards_row)
+                estimate += abs(col_of[neighbour] - towards_col)
+                heappush(heap, (g_next + estimate, g_next, neighbour))
+                if other_seen[neighbour] == query:
+                    total = g_next + other_cost[neighbour]
+                    if total < best:
+                        best, meeting = total, neighbour
+
+        if meeting == -1:
+            return [start]
+        path = []
+        index = meeting
+        while index != -1:
+            path.append(self._position(index))
+            index = self.parent[0][index]
+        path.reverse()
+        index = self.parent[1][meeting]
+        while index != -1:
+            path.append(self._position(index))
+            index = self.parent[1][index]
+        return path
+
+    def search_many(
+        self, queries: Iterable[tuple[TPosition, TPosition]]
+    ) -> Iterator[list[TPosition]]:
+        """Answer a stream of (start, goal) queries, yielding one path each."""
+        for start, goal in queries:
+            yield self.search(start, goal)
+
+    def queries_per_second(self, queries: list[tuple[TPosition, TPosition]]) -> float:
+        """
+        Throughput of search_many over queries.
+
+        >>> context = BidirectionalAStarContext(grid)
+        >>> context.queries_per_second([((0, 0), (6, 6))] * 10) > 0
+        True
+        """
+        begin = time.perf_counter()
+        for _ in self.search_many(queries):
+            pass
+        elapsed = time.perf_counter() - begin
+        return len(queries) / elapsed if elapsed > 0 else float("inf")
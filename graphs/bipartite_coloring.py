@@ -0,0 +1,121 @@
+"""
+Two-colouring of an undirected graph given as an edge array, with a proof when it
+fails.
+
+https://en.wikipedia.org/wiki/Bipartite_graph#Testing_bipartiteness
+
+check_bipartite_graph_bfs.py and check_bipartite_graph_dfs.py answer only True or
+False, and the DFS one recurses once per vertex.  Here the edges are packed into a
+``csr_graph.CSRGraph`` and every component is coloured by a breadth first search
+whose visit order doubles as the queue, with one byte of colour per vertex and a
+parent array: O(V + E) time, no recursion.  When two ends of an edge get the same
+colour they sit at the same depth of the BFS tree, so their tree paths up to the
+lowest common ancestor plus that edge form an odd cycle, returned as the
+certificate.
+
+>>> square = [(0, 1), (1, 2), (2, 3), (3, 0), (4, 5)]
+>>> list(two_coloring(6, square))
+[0, 1, 0, 1, 0, 1]
+>>> is_bipartite(6, square + [(0, 2)])
+False
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable
+
+from graphs.csr_graph import CSRGraph
+
+UNCOLORED = 2
+
+
+class OddCycleError(ValueError):
+    """Raised for a graph that is not bipartite; cycle has an odd length."""
+
+    def __init__(self, cycle: list[int]) -> None:
+        self.cycle = cycle
+        super().__init__(f"graph has an odd cycle: {cycle}")
+
+
+def _odd_cycle(parent: array, u: int, v: int) -> list[int]:
+    """
+    The cycle closed by the edge u-v between two vertices at the same BFS depth:
+    u up to the lowest common ancestor, then down to v.
+    """
+    up, down = [u], [v]
+    while up[-1] != down[-1]:
+        up.append(parent[up[-1]])
+        down.append(parent[down[-1]])
+    down.pop()
+    return up + down[::-1]
+
+
+def two_coloring(num_vertices: int, edges: Iterable[tuple[int, int]]) -> bytearray:
+    """
+    Colour 0 or 1 for each vertex so that every edge joins different colours; each
+    component starts from its smallest vertex with colour 0.
+
+    >>> list(two_coloring(5, [(0, 3), (3, 1), (2, 4)]))
+    [0, 0, 0, 1, 1]
+    >>> try:
+    ...     two_coloring(4, [(0, 1), (1, 2), (2, 0), (2, 3)])
+    ... except OddCycleError as error:
+    ...     print(error)
+    graph has an odd cycle: [1, 0, 2]
+    """
+    graph = CSRGraph.from_edges(num_vertices, edges, directed=False)
+    neighbors = graph.neighbors
+    color = bytearray([UNCOLORED]) * num_vertices
+    parent = array("l", [-1]) * num_vertices
+    for root in range(num_vertices):
+        if color[root] != UNCOLORED:
+            continue
+        color[root] = 0
+        order = [root]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            other = 1 - color[u]
+            for v in neighbors(u):
+                if color[v] == UNCOLORED:
+                    color[v] = other
+                    parent[v] = u
+                    order.append(v)
+                elif color[v] != other:
+                    raise OddCycleError(_odd_cycle(parent, u, v))
+    return color
+
+
+def find_odd_cycle(
+    num_vertices: int, edges: Iterable[tuple[int, int]]
+) -> list[int] | None:
+    """
+    The vertices of an odd cycle in order, or None when the graph is bipartite.
+    A self loop is an odd cycle of length one.
+
+    >>> find_odd_cycle(6, [(0, 1), (1, 2), (2, 3), (3, 4), (4, 0), (4, 5)])
+    [2, 1, 0, 4, 3]
+    >>> find_odd_cycle(3, [(1, 1)])
+    [1]
+    >>> find_odd_cycle(3, [(0, 1), (1, 2)]) is None
+    True
+    """
+    try:
+        two_coloring(num_vertices, edges)
+    except OddCycleError as error:
+        return error.cycle
+    return None
+
+
+def is_bipartite(num_vertices: int, edges: Iterable[tuple[int, int]]) -> bool:
+    """
+    >>> is_bipartite(4, [(0, 1), (2, 3)]), is_bipartite(3, [(0, 1), (1, 2), (2, 0)])
+    (True, False)
+    >>> graph = {0: [1, 3], 1: [0, 2], 2: [1, 3], 3: [0, 2]}
+    >>> edges = [(u, v) for u in graph for v in graph[u] if u < v]
+    >>> from graphs.check_bipartite_graph_bfs import check_bipartite
+    >>> is_bipartite(len(graph), edges) == check_bipartite(graph)
+    True
+    """
+    return find_odd_cycle(num_vertices, edges) is None
@@ -3,6 +3,8 @@ from a given source node to a target node in an unweighted graph.
 """
 from __future__ import annotations
 
+from collections import deque
+
 graph = {
     "A": ["B", "C", "E"],
     "B": ["A", "D", "E"],
@@ -35,10 +37,10 @@ class Graph:
         """
         visited = {self.source_vertex}
         self.parent[self.source_vertex] = None
-        queue = [self.source_vertex]  # first in first out queue
+        queue = deque([self.source_vertex])  # first in first out queue
 
         while queue:
-            vertex = queue.pop(0)
+            vertex = queue.popleft()
             for adjacent_vertex in self.graph[vertex]:
                 if adjacent_vertex not in visited:
                     visited.add(adjacent_vertex)
@@ -68,14 +70,16 @@ class Graph:
         >>> g.shortest_path("G")
         'G'
         """
-        if target_vertex == self.source_vertex:
-            return self.source_vertex
-
-        target_vertex_parent = self.parent.get(target_vertex)
-        if target_vertex_parent is None:
+        if target_vertex != self.source_vertex and (
+            self.parent.get(target_vertex) is None
+        ):
             msg = (
                 f"No path from vertex: {self.source_vertex} to vertex: {target_vertex}"
             )
             raise ValueError(msg)
 
-        return self.shortest_path(target_vertex_parent) + f"->{target_vertex}"
\ No newline at end of file
+        # Follow the parents back to the source without recursing.
+        path = [target_vertex]
+        while path[-1] != self.source_vertex:
+            path.append(self.parent[path[-1]])
+        return "->".join(reversed(path))
\ No newline at end of file
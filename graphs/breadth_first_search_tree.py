@@ -0,0 +1,128 @@
+"""
+Breadth first search trees for unweighted shortest paths.
+
+https://en.wikipedia.org/wiki/Breadth-first_search
+
+breadth_first_search_shortest_path.Graph keeps parents in a dict and builds path
+strings recursively, and breadth_first_search_shortest_path_2 queues a whole path
+list per vertex, O(V * path length) memory.  ``bfs`` runs once per query and keeps
+three flat arrays (distance, parent and the seed each vertex was reached from), so
+memory is O(V); any number of paths are then read back lazily from the parent
+array with ``BFSTree.walk_back`` or ``BFSTree.path_to``.
+
+Several seeds at once give the nearest facility of every vertex, ``max_depth``
+stops the search after that many hops and ``target`` stops it as soon as the
+target is reached.
+
+>>> from graphs.breadth_first_search_shortest_path import graph
+>>> tree = bfs(graph, ["G"])
+>>> tree.path_to("D"), tree.distance_to("D")
+(['G', 'C', 'A', 'B', 'D'], 4)
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable
+from math import inf
+from typing import Any
+
+from graphs.csr_graph import CSRGraph
+from graphs.dijkstra_binary_heap import ShortestPaths
+
+
+class BFSTree(ShortestPaths):
+    """
+    ShortestPaths whose distances count edges, plus the seed every reached vertex
+    is closest to.
+    """
+
+    def __init__(
+        self, graph: CSRGraph, distance: list[Any], parent: array, origin: array
+    ) -> None:
+        super().__init__(graph, distance, parent)
+        self.origin = origin
+
+    def nearest_source(self, vertex: Hashable) -> Hashable | None:
+        """The closest seed to ``vertex``, None when no seed reaches it."""
+        origin = self.origin[self._id(vertex)]
+        return None if origin == -1 else self._label(origin)
+
+
+def _as_csr(graph: Any) -> CSRGraph:
+    if hasattr(graph, "neighbors"):  # a CSRGraph
+        return graph
+    if not isinstance(graph, dict):
+        graph = dict(enumerate(graph))
+    return CSRGraph.from_dict(graph)
+
+
+def bfs(
+    graph: Any,
+    sources: Iterable[Hashable],
+    max_depth: int | None = None,
+    target: Hashable | None = None,
+) -> BFSTree:
+    """
+    Breadth first search from every vertex in ``sources`` at once.  ``graph`` is a
+    CSRGraph, a dict of adjacency lists or a list of them.
+
+    >>> streets = {0: [1, 3], 1: [0, 2], 2: [1, 5], 3: [0, 4], 4: [3, 5],
+    ...            5: [2, 4, 6], 6: [5], 7: []}
+    >>> tree = bfs(streets, [0])
+    >>> tree.distance, tree.path_to(6), tree.reached(7)
+    ([0, 1, 2, 1, 2, 3, 4, inf], [0, 1, 2, 5, 6], False)
+
+    Nearest facility: every vertex learns its closest seed.
+
+    >>> tree = bfs(streets, [0, 6])
+    >>> [tree.nearest_source(v) for v in range(8)]
+    [0, 0, 0, 0, 0, 6, 6, None]
+    >>> list(tree.walk_back(2))
+    [2, 1, 0]
+
+    Bounded depth and early exit leave the vertices further away unreached.
+
+    >>> bfs(streets, [0], max_depth=1).distance
+    [0, 1, inf, 1, inf, inf, inf, inf]
+    >>> bfs(streets, [0], target=4).distance
+    [0, 1, 2, 1, 2, inf, inf, inf]
+    """
+    csr = _as_csr(graph)
+    vertex_id = csr.vertex_id
+    n = len(csr)
+    distance: list[Any] = [inf] * n
+    parent = array("l", [-1]) * n
+    origin = array("l", [-1]) * n
+    goal = -1
+    if target is not None:
+        goal = target if vertex_id is None else vertex_id[target]
+
+    # The visit order doubles as the FIFO queue.
+    order: list[int] = []
+    for source in sources:
+        source_id = source if vertex_id is None else vertex_id[source]
+        if distance[source_id] == inf:
+            distance[source_id] = 0
+            origin[source_id] = source_id
+            order.append(source_id)
+    if goal in order:
+        return BFSTree(csr, distance, parent, origin)
+
+    neighbors = csr.neighbors
+    head = 0
+    while head < len(order):
+        u = order[head]
+        head += 1
+        depth = distance[u] + 1
+        if max_depth is not None and depth > max_depth:
+            break  # the queue is in depth order, everything left is as deep
+        seed = origin[u]
+        for v in neighbors(u):
+            if distance[v] == inf:
+                distance[v] = depth
+                parent[v] = u
+                origin[v] = seed
+                if v == goal:
+                    return BFSTree(csr, distance, parent, origin)
+                order.append(v)
+    return BFSTree(csr, distance, parent, origin)
@@ -0,0 +1,402 @@
+"""
+Compressed sparse row (CSR) representation of a graph.
+
+https://en.wikipedia.org/wiki/Sparse_matrix#Compressed_sparse_row_(CSR,_CRS_or_Yale_format)
+
+The neighbours of every vertex are stored back to back in one flat typed array
+(``indices``) and ``indptr[u]:indptr[u + 1]`` is the slice that belongs to vertex
+``u``.  Compared with a dict of Python lists this needs 4 or 8 bytes per edge
+instead of a pointer plus a boxed int, and walking a neighbourhood is a scan over
+contiguous memory.
+
+Vertices are always the integers ``0 .. num_vertices - 1``.  Graphs built from
+arbitrary hashable vertices (for example a ``GraphAdjacencyList`` of strings) keep
+the original names in ``labels`` and the reverse mapping in ``vertex_id``.
+
+A ``CSRGraph`` behaves like the read-only dict-of-lists that most of the modules in
+this directory take as input: ``len(graph)``, ``graph[u]``, ``graph.values()`` and
+``for u in graph`` all work.  For unweighted graphs ``graph[u]`` is a zero copy view
+of the neighbour ids, for weighted graphs it is a list of ``(neighbour, weight)``
+pairs, the same shape ``dijkstra.py`` and ``minimum_spanning_tree_prims.py`` expect.
+
+>>> from graphs.depth_first_search import depth_first_search
+>>> from graphs.tarjans_scc import tarjan
+>>> graph = CSRGraph.from_edges(5, [(0, 1), (1, 2), (2, 0), (2, 3), (3, 4)])
+>>> sorted(depth_first_search(graph, 0))
+[0, 1, 2, 3, 4]
+>>> sorted(sorted(component) for component in tarjan(graph))
+[[0, 1, 2], [3], [4]]
+
+>>> from graphs.dijkstra import dijkstra
+>>> from graphs.minimum_spanning_tree_kruskal import kruskal
+>>> from graphs.minimum_spanning_tree_prims import prisms_algorithm
+>>> roads = CSRGraph.from_edges(
+...     4, [(0, 1, 3), (1, 2, 5), (2, 3, 1), (0, 2, 1), (0, 3, 2)], directed=False
+... )
+>>> dijkstra(roads, 1, 3)
+5
+>>> kruskal(len(roads), roads.edge_list())
+[(0, 2, 1), (2, 3, 1), (0, 1, 3)]
+>>> prisms_algorithm(roads)
+[(0, 2), (2, 3), (0, 1)]
+"""
+from __future__ import annotations
+
+from array import array
+from collections.abc import Hashable, Iterable, Iterator
+from typing import Any
+
+# Vertex ids are stored as C ints while they fit, which halves the size of the
+# ``indices`` array compared with 64 bit ids.
+INT32_MAX = 2**31 - 1
+
+
+def _index_typecode(num_vertices: int) -> str:
+    """
+    Smallest signed array typecode able to hold every vertex id.
+
+    >>> _index_typecode(10)
+    'i'
+    >>> _index_typecode(2**31)
+    'q'
+    """
+    return "i" if num_vertices <= INT32_MAX else "q"
+
+
+def _weight_typecode(weights: Iterable[Any]) -> str:
+    """
+    Integer weights are kept exact, anything else is stored as a C double.
+
+    >>> _weight_typecode([1, 2, 3])
+    'q'
+    >>> _weight_typecode([1, 2.5])
+    'd'
+    """
+    return "q" if all(isinstance(weight, int) for weight in weights) else "d"
+
+
+class CSRGraph:
+    """
+    Array backed graph in compressed sparse row format.
+
+    >>> graph = CSRGraph.from_edges(4, [(0, 1), (0, 2), (2, 3)], directed=False)
+    >>> graph
+    CSRGraph(num_vertices=4, num_edges=3, directed=False, weighted=False)
+    >>> len(graph), graph.num_arcs
+    (4, 6)
+    >>> list(graph[0]), list(graph[2]), graph.degree(3)
+    ([1, 2], [0, 3], 1)
+    >>> list(graph.edges())
+    [(0, 1), (0, 2), (2, 3)]
+    >>> graph.nbytes
+    64
+    """
+
+    def __init__(
+        self,
+        indptr: array,
+        indices: array,
+        weights: array | None = None,
+        directed: bool = True,
+        labels: list[Hashable] | None = None,
+    ) -> None:
+        """
+        Wrap already built CSR arrays; most callers want one of the ``from_*``
+        constructors instead.
+
+        >>> CSRGraph(array("q", [0, 1]), array("i", [0, 1]))
+        Traceback (most recent call last):
+            ...
+        ValueError: indptr must end at len(indices)
+        """
+        if len(indptr) == 0 or indptr[0] != 0 or indptr[-1] != len(indices):
+            raise ValueError("indptr must end at len(indices)")
+        if weights is not None and len(weights) != len(indices):
+            raise ValueError("weights and indices must have the same length")
+        if labels is not None and len(labels) != len(indptr) - 1:
+            raise ValueError("there must be exactly one label per vertex")
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.directed = directed
+        self.labels = labels
+        self.vertex_id: dict[Hashable, int] | None = (
+            None if labels is None else {label: i for i, label in enumerate(labels)}
+        )
+        # Slicing a memoryview does not copy, slicing an array does.
+        self._indices_view = memoryview(indices)
+        self._weights_view = None if weights is None else memoryview(weights)
+        self._num_edges: int | None = None
+
+    @classmethod
+    def from_edges(
+        cls,
+        num_vertices: int,
+        edges: Iterable[tuple[int, int] | tuple[int, int, Any]],
+        directed: bool = True,
+        weighted: bool | None = None,
+    ) -> CSRGraph:
+        """
+        Build a graph from ``(u, v)`` or ``(u, v, weight)`` tuples with a counting
+        sort, in O(V + E) time.  Undirected edges are stored in both directions.
+        Neighbours keep the order in which their edges were given.  ``weighted``
+        defaults to the shape of the first edge; every edge must have that shape.
+
+        >>> graph = CSRGraph.from_edges(3, [(0, 2, 7), (0, 1, 4), (1, 2, 1)])
+        >>> graph[0]
+        [(2, 7), (1, 4)]
+        >>> graph.weights
+        array('q', [7, 4, 1])
+        >>> CSRGraph.from_edges(2, [(0, 2)])
+        Traceback (most recent call last):
+            ...
+        ValueError: edge (0, 2) references a vertex outside 0..1
+        >>> CSRGraph.from_edges(3, [], weighted=True).weights
+        array('q')
+        >>> CSRGraph.from_edges(3, [(0, 1, 4), (1, 2)])
+        Traceback (most recent call last):
+            ...
+        ValueError: edge (1, 2) should be a (u, v, weight) tuple
+        >>> CSRGraph.from_edges(3, [(0, 1), (1, 2, 4)])
+        Traceback (most recent call last):
+            ...
+        ValueError: edge (1, 2, 4) should be a (u, v) tuple
+        """
+        edges = edges if isinstance(edges, list) else list(edges)
+        if weighted is None:
+            weighted = bool(edges) and len(edges[0]) == 3
+        arity, shape = (3, "(u, v, weight)") if weighted else (2, "(u, v)")
+        degree = [0] * (num_vertices + 1)
+        for edge in edges:
+            if len(edge) != arity:
+                raise ValueError(f"edge {edge} should be a {shape} tuple")
+            u, v = edge[0], edge[1]
+            if not (0 <= u < num_vertices and 0 <= v < num_vertices):
+                msg = f"edge {edge} references a vertex outside 0..{num_vertices - 1}"
+                raise ValueError(msg)
+            degree[u + 1] += 1
+            if not directed and u != v:
+                degree[v + 1] += 1
+
+        for u in range(num_vertices):
+            degree[u + 1] += degree[u]
+        indptr = array("q", degree)
+        num_arcs = degree[num_vertices]
+
+        indices = array(_index_typecode(num_vertices), [0]) * num_arcs
+        if weighted:
+            typecode = _weight_typecode(edge[2] for edge in edges)
+            weights: array | None = array(typecode, [0]) * num_arcs
+        else:
+            weights = None
+
+        # ``degree`` is reused as the insertion cursor of every vertex.
+        cursor = degree
+        for edge in edges:
+            u, v = edge[0], edge[1]
+            position = cursor[u]
+            indices[position] = v
+            cursor[u] = position + 1
+            if weights is not None:
+                weights[position] = edge[2]
+            if not directed and u != v:
+                position = cursor[v]
+                indices[position] = u
+                cursor[v] = position + 1
+                if weights is not None:
+                    weights[position] = edge[2]
+        return cls(indptr, indices, weights, directed)
+
+    @classmethod
+    def from_dict(
+        cls, graph: dict, directed: bool = True, weighted: bool = False
+    ) -> CSRGraph:
+        """
+        Convert a dict of adjacency lists, ``{u: [v, ...]}`` or, with
+        ``weighted=True``, ``{u: [(v, weight), ...]}``.  Keys that are not
+        ``0 .. n - 1`` are relabelled and the originals kept in ``labels``.
+
+        >>> graph = CSRGraph.from_dict({"A": ["B", "C"], "B": ["C"], "C": []})
+        >>> graph.labels, list(graph[graph.vertex_id["A"]])
+        (['A', 'B', 'C'], [1, 2])
+        >>> graph = CSRGraph.from_dict(
+        ...     {0: [[1, 5]], 1: [[0, 5]]}, directed=False, weighted=True
+        ... )
+        >>> graph[1], graph.num_edges
+        ([(0, 5)], 1)
+        """
+        vertex_id = {label: i for i, label in enumerate(graph)}
+        labels = list(graph)
+        for adjacent in graph.values():
+            for item in adjacent:
+                vertex = item[0] if weighted else item
+                if vertex not in vertex_id:
+                    vertex_id[vertex] = len(labels)
+                    labels.append(vertex)
+        identity = all(label == i for i, label in enumerate(labels))
+
+        edges: list[tuple] = []
+        for u, adjacent in graph.items():
+            uid = vertex_id[u]
+            if weighted:
+                edges.extend((uid, vertex_id[v], weight) for v, weight in adjacent)
+            else:
+                edges.extend((uid, vertex_id[v]) for v in adjacent)
+        # Undirected dicts already list every edge from both ends.
+        result = cls.from_edges(len(labels), edges, directed=True, weighted=weighted)
+        result.directed = directed
+        if not identity:
+            result.labels = labels
+            result.vertex_id = vertex_id
+        return result
+
+    @classmethod
+    def from_adjacency_list(cls, graph: Any) -> CSRGraph:
+        """
+        Convert a ``graph_list.GraphAdjacencyList``.
+
+        >>> from graphs.graph_list import GraphAdjacencyList
+        >>> adjacency = GraphAdjacencyList(directed=False)
+        >>> adjacency = adjacency.add_edge("a", "b").add_edge("b", "c")
+        >>> graph = CSRGraph.from_adjacency_list(adjacency)
+        >>> graph.directed, graph.num_edges, graph.labels
+        (False, 2, ['a', 'b', 'c'])
+        >>> [graph.labels[v] for v in graph[graph.vertex_id["b"]]]
+        ['a', 'c']
+        """
+        return cls.from_dict(graph.adj_list, directed=graph.directed)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def num_arcs(self) -> int:
+        """Number of stored (directed) adjacency entries."""
+        return len(self.indices)
+
+    @property
+    def num_edges(self) -> int:
+        """
+        Number of edges; an undirected edge stored in both directions counts once.
+
+        >>> CSRGraph.from_edges(2, [(0, 0), (0, 1)], directed=False).num_edges
+        2
+        """
+        if self.directed:
+            return len(self.indices)
+        if self._num_edges is None:
+            self._num_edges = sum(1 for _ in self.edges())
+        return self._num_edges
+
+    @property
+    def is_weighted(self) -> bool:
+        return self.weights is not None
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the three backing arrays."""
+        total = self.indptr.itemsize * len(self.indptr)
+        total += self.indices.itemsize * len(self.indices)
+        if self.weights is not None:
+            total += self.weights.itemsize * len(self.weights)
+        return total
+
+    def degree(self, vertex: int) -> int:
+        return self.indptr[vertex + 1] - self.indptr[vertex]
+
+    def neighbors(self, vertex: int) -> memoryview:
+        """
+        Zero copy view of the neighbour ids of ``vertex``, whether or not the
+        graph is weighted.
+
+        >>> graph = CSRGraph.from_edges(3, [(0, 1, 2.5), (0, 2, 1.0)])
+        >>> graph.neighbors(0).tolist(), graph.neighbor_weights(0).tolist()
+        ([1, 2], [2.5, 1.0])
+        """
+        return self._indices_view[self.indptr[vertex] : self.indptr[vertex + 1]]
+
+    def neighbor_weights(self, vertex: int) -> memoryview:
+        if self._weights_view is None:
+            raise ValueError("graph is unweighted")
+        return self._weights_view[self.indptr[vertex] : self.indptr[vertex + 1]]
+
+    def edges(self) -> Iterator[tuple]:
+        """
+        Yield every edge once as ``(u, v)`` or ``(u, v, weight)``.  For undirected
+        graphs only the copy with ``u <= v`` is reported.
+        """
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        for u in range(self.num_vertices):
+            for position in range(indptr[u], indptr[u + 1]):
+                v = indices[position]
+                if not self.directed and v < u:
+                    continue
+                if weights is None:
+                    yield u, v
+                else:
+                    yield u, v, weights[position]
+
+    def edge_list(self) -> list[tuple]:
+        """Edges as a list, the input format of ``minimum_spanning_tree_kruskal``."""
+        return list(self.edges())
+
+    def reverse(self) -> CSRGraph:
+        """
+        Graph with every arc flipped (the transpose), built in O(V + E).
+
+        >>> graph = CSRGraph.from_edges(3, [(0, 1), (0, 2), (1, 2)]).reverse()
+        >>> [list(graph[u]) for u in graph]
+        [[], [0], [0, 1]]
+        """
+        if not self.directed:
+            return self
+        arcs: list[tuple] = []
+        indptr, indices, weights = self.indptr, self.indices, self.weights
+        for u in range(self.num_vertices):
+            for position in range(indptr[u], indptr[u + 1]):
+                if weights is None:
+                    arcs.append((indices[position], u))
+                else:
+                    arcs.append((indices[position], u, weights[position]))
+        reverse = CSRGraph.from_edges(self.num_vertices, arcs, directed=True)
+        reverse.labels, reverse.vertex_id = self.labels, self.vertex_id
+        return reverse
+
+    # Read-only mapping protocol, so dict based algorithms accept a CSRGraph.
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.indptr) - 1))
+
+    def __contains__(self, vertex: object) -> bool:
+        return isinstance(vertex, int) and 0 <= vertex < len(self.indptr) - 1
+
+    def __getitem__(self, vertex: int) -> Any:
+        start, stop = self.indptr[vertex], self.indptr[vertex + 1]
+        if self._weights_view is None:
+            return self._indices_view[start:stop]
+        return list(
+            zip(
+                self._indices_view[start:stop].tolist(),
+                self._weights_view[start:stop].tolist(),
+            )
+        )
+
+    def keys(self) -> range:
+        return range(len(self.indptr) - 1)
+
+    def values(self) -> Iterator[Any]:
+        return (self[u] for u in range(len(self.indptr) - 1))
+
+    def items(self) -> Iterator[tuple[int, Any]]:
+        return ((u, self[u]) for u in range(len(self.indptr) - 1))
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(num_vertices={self.num_vertices}, "
+            f"num_edges={self.num_edges}, directed={self.directed}, "
+            f"weighted={self.is_weighted})"
+        )
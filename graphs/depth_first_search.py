@@ -16,7 +16,7 @@ def depth_first_search(graph: dict, start: str) -> set[str]:
     >>> all(x in output_G for x in list(depth_first_search(input_G, "G")))
     True
     """
-    explored, stack = set(start), [start]
+    explored, stack = {start}, [start]
 
     while stack:
         v = stack.pop()
@@ -21,11 +21,11 @@ class PriorityQueue:
     def min_heapify(self, idx):
         lc = self.left(idx)
         rc = self.right(idx)
-        if lc < self.cur_size and self.array(lc)[0] < self.array(idx)[0]:
+        if lc < self.cur_size and self.array[lc][0] < self.array[idx][0]:
             smallest = lc
         else:
             smallest = idx
-        if rc < self.cur_size and self.array(rc)[0] < self.array(smallest)[0]:
+        if rc < self.cur_size and self.array[rc][0] < self.array[smallest][0]:
             smallest = rc
         if smallest != idx:
             self.swap(idx, smallest)
@@ -41,9 +41,12 @@ class PriorityQueue:
     def extract_min(self):
         # Removes and returns the min element at top of priority queue
         min_node = self.array[0][1]
-        self.array[0] = self.array[self.cur_size - 1]
+        last = self.array.pop()
         self.cur_size -= 1
-        self.min_heapify(1)
+        if self.cur_size > 0:
+            self.array[0] = last
+            self.pos[last[1]] = 0
+            self.min_heapify(0)
         del self.pos[min_node]
         return min_node
 
@@ -57,7 +60,7 @@ class PriorityQueue:
 
     def par(self, i):
         # returns the index of parent
-        return math.floor(i / 2)
+        return math.floor((i - 1) / 2)
 
     def swap(self, i, j):
         # swaps array elements at indices i and j
@@ -1,3 +1,6 @@
+from collections import deque
+
+
 class FlowNetwork:
     def __init__(self, graph, sources, sinks):
         self.source_index = None
@@ -10,9 +13,9 @@ class FlowNetwork:
 
     # make only one source and one sink
     def _normalize_graph(self, sources, sinks):
-        if sources is int:
+        if isinstance(sources, int):
             sources = [sources]
-        if sinks is int:
+        if isinstance(sinks, int):
             sinks = [sinks]
 
         if len(sources) == 0 or len(sinks) == 0:
@@ -23,7 +26,17 @@ class FlowNetwork:
 
         # make fake vertex if there are more
         # than one source or sink
-        if len(sources) > 1 or len(sinks) > 1:
+        if (len(sources) > 1 or len(sinks) > 1) and self._is_sparse():
+            # sparse rows {neighbour: capacity}: append the fake vertices at the
+            # end so that no existing index has to be shifted
+            max_input_flow = sum(sum(self.graph[i].values()) for i in sources)
+            self.source_index = len(self.graph)
+            self.graph.append(dict.fromkeys(sources, max_input_flow))
+            self.sink_index = len(self.graph)
+            for i in sinks:
+                self.graph[i][self.sink_index] = max_input_flow
+            self.graph.append({})
+        elif len(sources) > 1 or len(sinks) > 1:
             max_input_flow = 0
             for i in sources:
                 max_input_flow += sum(self.graph[i])
@@ -44,6 +57,10 @@ class FlowNetwork:
                 self.graph[i + 1][size - 1] = max_input_flow
             self.sink_index = size - 1
 
+    def _is_sparse(self):
+        # rows given as {neighbour: capacity} dicts instead of a V x V matrix
+        return any(isinstance(row, dict) for row in self.graph)
+
     def find_maximum_flow(self):
         if self.maximum_flow_algorithm is None:
             raise Exception("You need to set maximum flow algorithm before.")
@@ -51,7 +68,7 @@ class FlowNetwork:
             return 0
 
         self.maximum_flow_algorithm.execute()
-        return self.maximum_flow_algorithm.getMaximumFlow()
+        return self.maximum_flow_algorithm.get_maximum_flow()
 
     def set_maximum_flow_algorithm(self, algorithm):
         self.maximum_flow_algorithm = algorithm(self)
@@ -60,9 +77,9 @@ class FlowNetwork:
 class FlowNetworkAlgorithmExecutor:
     def __init__(self, flow_network):
         self.flow_network = flow_network
-        self.verticies_count = flow_network.verticesCount
-        self.source_index = flow_network.sourceIndex
-        self.sink_index = flow_network.sinkIndex
+        self.verticies_count = flow_network.vertices_count
+        self.source_index = flow_network.source_index
+        self.sink_index = flow_network.sink_index
         # it's just a reference, so you shouldn't change
         # it in your algorithms, use deep copy before doing that
         self.graph = flow_network.graph
@@ -167,4 +184,215 @@ class PushRelabelExecutor(MaximumFlowAlgorithmExecutor):
                 min_height = self.heights[to_index]
 
         if min_height is not None:
-            self.heights[vertex_index] = min_height + 1
\ No newline at end of file
+            self.heights[vertex_index] = min_height + 1
+
+
+class SparsePushRelabelExecutor(MaximumFlowAlgorithmExecutor):
+    """
+    Push-relabel on adjacency lists, so memory is O(V + E) and a discharge only
+    looks at the arcs of its own vertex.  Works on matrix networks and on sparse
+    networks whose rows are {neighbour: capacity} dicts.
+
+    Active vertices are picked by highest label (this class) or first in, first
+    out (FifoPushRelabelExecutor).  Two heuristics keep the number of relabels
+    low: a global relabel recomputes exact distances to the sink with a reverse
+    breadth first search every V relabels, and when no vertex is left at some
+    height h (a gap) every vertex above h is cut off from the sink at once.
+
+    Only the first phase runs, which already leaves the value of the maximum flow
+    as the excess of the sink.
+
+    >>> graph = [[0, 7, 0, 0], [0, 0, 6, 0], [0, 0, 0, 8], [9, 0, 0, 0]]
+    >>> network = FlowNetwork(graph, [0], [3])
+    >>> network.set_maximum_flow_algorithm(SparsePushRelabelExecutor)
+    >>> network.find_maximum_flow()
+    6
+    >>> sparse = [{1: 4, 2: 2}, {3: 3}, {3: 5}, {}, {2: 4}, {}]
+    >>> network = FlowNetwork(sparse, [0, 4], [3, 5])
+    >>> network.set_maximum_flow_algorithm(FifoPushRelabelExecutor)
+    >>> network.find_maximum_flow()
+    8
+    """
+
+    fifo = False
+
+    def __init__(self, flow_network):
+        super().__init__(flow_network)
+        n = self.verticies_count
+        # residual arcs: arc e goes to head[e] and its reverse arc is e ^ 1
+        self.head = []
+        self.capacity = []
+        arcs_of = [[] for _ in range(n)]
+        for u, row in enumerate(self.graph):
+            items = row.items() if isinstance(row, dict) else enumerate(row)
+            for v, bandwidth in items:
+                if bandwidth > 0 and u != v:
+                    arcs_of[u].append(len(self.head))
+                    self.head.append(v)
+                    self.capacity.append(bandwidth)
+                    arcs_of[v].append(len(self.head))
+                    self.head.append(u)
+                    self.capacity.append(0)
+        # flatten the arc lists: arcs of u are arcs[arc_start[u]:arc_start[u + 1]]
+        self.arc_start = [0] * (n + 1)
+        for u in range(n):
+            self.arc_start[u + 1] = self.arc_start[u] + len(arcs_of[u])
+        self.arcs = [arc for arcs in arcs_of for arc in arcs]
+
+        self.heights = [0] * n
+        self.excesses = [0] * n
+        self.current_arc = self.arc_start[:n]
+        self.height_counts = [0] * (n + 1)
+
+    def _global_relabel(self):
+        # exact distance to the sink in the residual graph, n if unreachable
+        n, sink = self.verticies_count, self.sink_index
+        head, capacity, arcs, arc_start = (
+            self.head,
+            self.capacity,
+            self.arcs,
+            self.arc_start,
+        )
+        heights = self.heights
+        heights[:] = [n] * n
+        heights[sink] = 0
+        queue = deque([sink])
+        while queue:
+            v = queue.popleft()
+            next_height = heights[v] + 1
+            for i in range(arc_start[v], arc_start[v + 1]):
+                arc = arcs[i]
+                u = head[arc]
+                if heights[u] == n and capacity[arc ^ 1] > 0 and u != sink:
+                    heights[u] = next_height
+                    queue.append(u)
+        heights[self.source_index] = n
+        self.height_counts = [0] * (n + 1)
+        for height in heights:
+            self.height_counts[height] += 1
+        self.current_arc = arc_start[:n]
+
+    def _gap(self, height):
+        # nothing is left at height, so nothing above it can reach the sink
+        n, heights, counts = self.verticies_count, self.heights, self.height_counts
+        for u in range(n):
+            if height < heights[u] < n:
+                counts[heights[u]] -= 1
+                counts[n] += 1
+                heights[u] = n
+
+    def _algorithm(self):
+        n = self.verticies_count
+        source, sink = self.source_index, self.sink_index
+        head, capacity, arcs, arc_start = (
+            self.head,
+            self.capacity,
+            self.arcs,
+            self.arc_start,
+        )
+        heights, excesses = self.heights, self.excesses
+
+        self._global_relabel()
+        active = deque()
+        buckets = [[] for _ in range(n + 1)]
+        highest = 0
+
+        def activate(u):
+            nonlocal highest
+            if self.fifo:
+                active.append(u)
+            else:
+                buckets[heights[u]].append(u)
+                highest = max(highest, heights[u])
+
+        # push some substance to graph
+        for i in range(arc_start[source], arc_start[source + 1]):
+            arc = arcs[i]
+            bandwidth = capacity[arc]
+            if bandwidth > 0:
+                v = head[arc]
+                capacity[arc] = 0
+                capacity[arc ^ 1] += bandwidth
+                if excesses[v] == 0 and v != sink and heights[v] < n:
+                    activate(v)
+                excesses[v] += bandwidth
+                excesses[source] -= bandwidth
+
+        relabels_since_global = 0
+        while True:
+            if self.fifo:
+                if not active:
+                    break
+                v = active.popleft()
+            else:
+                while highest >= 0 and not buckets[highest]:
+                    highest -= 1
+                if highest < 0:
+                    break
+                v = buckets[highest].pop()
+            # skip entries made stale by a gap or a global relabel
+            if excesses[v] <= 0 or heights[v] >= n:
+                continue
+            if not self.fifo and heights[v] != highest:
+                activate(v)
+                continue
+
+            # discharge v
+            counts = self.height_counts
+            while excesses[v] > 0:
+                i = self.current_arc[v]
+                if i == arc_start[v + 1]:
+                    # relabel
+                    old_height = heights[v]
+                    min_height = 2 * n
+                    for j in range(arc_start[v], arc_start[v + 1]):
+                        arc = arcs[j]
+                        if capacity[arc] > 0 and heights[head[arc]] < min_height:
+                            min_height = heights[head[arc]]
+                    counts[old_height] -= 1
+                    if counts[old_height] == 0:
+                        self._gap(old_height)
+                        heights[v] = n
+                        counts[n] += 1
+                        break
+                    heights[v] = min(min_height + 1, n)
+                    counts[heights[v]] += 1
+                    self.current_arc[v] = arc_start[v]
+                    relabels_since_global += 1
+                    if heights[v] >= n:
+                        break
+                    continue
+                arc = arcs[i]
+                u = head[arc]
+                if capacity[arc] > 0 and heights[v] == heights[u] + 1:
+                    # push
+                    delta = min(excesses[v], capacity[arc])
+                    capacity[arc] -= delta
+                    capacity[arc ^ 1] += delta
+                    if excesses[u] == 0 and u != sink and u != source:
+                        activate(u)
+                    excesses[u] += delta
+                    excesses[v] -= delta
+                    if capacity[arc] == 0:
+                        self.current_arc[v] = i + 1
+                else:
+                    self.current_arc[v] = i + 1
+
+            if relabels_since_global >= n:
+                relabels_since_global = 0
+                self._global_relabel()
+                counts = self.height_counts
+                active.clear()
+                buckets = [[] for _ in range(n + 1)]
+                highest = 0
+                for u in range(n):
+                    if excesses[u] > 0 and u not in (source, sink) and heights[u] < n:
+                        activate(u)
+            elif excesses[v] > 0 and heights[v] < n:
+                activate(v)
+
+        self.maximum_flow = excesses[sink]
+
+
+class FifoPushRelabelExecutor(SparsePushRelabelExecutor):
+    fifo = True
@@ -3,6 +3,7 @@
 # vertex.
 # time complexity is O(V+E)
 # space complexity is O(VE)
+# hierholzer.py walks multigraphs (directed or not) in O(V + E) time and memory.
 
 
 # using dfs for finding eulerian path traversal
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections import deque
+from heapq import heappush, heapreplace
+
 
 def stable_matching(
     donor_pref: list[list[int]], recipient_pref: list[list[int]]
@@ -22,28 +25,74 @@ def stable_matching(
     """
     assert len(donor_pref) == len(recipient_pref)
 
-    n = len(donor_pref)
-    unmatched_donors = list(range(n))
-    donor_record = [-1] * n  # who the donor has donated to
-    rec_record = [-1] * n  # who the recipient has received from
-    num_donations = [0] * n
+    return capacitated_stable_matching(donor_pref, recipient_pref)
+
+
+def capacitated_stable_matching(
+    donor_pref: list[list[int]],
+    recipient_pref: list[list[int]],
+    capacities: list[int] | None = None,
+) -> list[int]:
+    """
+    Donor-optimal stable matching in the hospitals/residents form: every recipient
+    may accept up to capacities[recipient] donors (1 by default), and preference
+    lists may be incomplete.  A donor and a recipient can only be matched when each
+    lists the other.  Returns the recipient of every donor, or -1 for donors left
+    unmatched.
+
+    Each recipient's list is inverted once into a dict of donor -> rank, O(L) for
+    L preference entries however sparse the lists are, so comparing two donors is
+    a single lookup instead of two list.index calls, and free donors wait in a
+    deque.  Every donor proposes to each recipient at most once and a recipient
+    over capacity drops its worst held donor from a heap, so the whole matching
+    takes O(L log c) for largest capacity c.
+
+    >>> donor_pref = [[0, 1], [0, 1], [0], [1, 0]]
+    >>> recipient_pref = [[3, 0, 1, 2], [0, 1, 3]]
+    >>> capacitated_stable_matching(donor_pref, recipient_pref, [2, 1])
+    [0, 0, -1, 1]
+    >>> capacitated_stable_matching(donor_pref, recipient_pref)
+    [1, -1, -1, 0]
+    >>> capacitated_stable_matching([[0]], [[0]], [0])
+    [-1]
+    """
+    num_donors, num_recipients = len(donor_pref), len(recipient_pref)
+    if capacities is None:
+        capacities = [1] * num_recipients
+    elif len(capacities) != num_recipients:
+        raise ValueError("capacities needs one entry per recipient")
+
+    # rank[recipient][donor] is the position of donor in the recipient's list;
+    # donors the recipient did not rank are missing.
+    rank = [
+        {donor: position for position, donor in enumerate(preference)}
+        for preference in recipient_pref
+    ]
+
+    donor_record = [-1] * num_donors  # who the donor has donated to
+    num_donations = [0] * num_donors
+    # held[recipient] is a heap of (-rank, donor), so its worst donor is on top
+    held: list[list[tuple[int, int]]] = [[] for _ in range(num_recipients)]
+    unmatched_donors = deque(range(num_donors))
 
     while unmatched_donors:
-        donor = unmatched_donors[0]
-        donor_preference = donor_pref[donor]
-        recipient = donor_preference[num_donations[donor]]
-        num_donations[donor] += 1
-        rec_preference = recipient_pref[recipient]
-        prev_donor = rec_record[recipient]
-
-        if prev_donor != -1:
-            if rec_preference.index(prev_donor) > rec_preference.index(donor):
-                rec_record[recipient] = donor
+        donor = unmatched_donors.popleft()
+        preference = donor_pref[donor]
+        while num_donations[donor] < len(preference):
+            recipient = preference[num_donations[donor]]
+            num_donations[donor] += 1
+            donor_rank = rank[recipient].get(donor)
+            if donor_rank is None:
+                continue  # the recipient does not accept this donor
+            holding = held[recipient]
+            if len(holding) < capacities[recipient]:
+                heappush(holding, (-donor_rank, donor))
+                donor_record[donor] = recipient
+                break
+            if holding and -holding[0][0] > donor_rank:
+                prev_donor = heapreplace(holding, (-donor_rank, donor))[1]
+                donor_record[prev_donor] = -1
                 donor_record[donor] = recipient
                 unmatched_donors.append(prev_donor)
-                unmatched_donors.remove(donor)
-        else:
-            rec_record[recipient] = donor
-            donor_record[donor] = recipient
-            unmatched_donors.remove(donor)
+                break
     return donor_record
@@ -3,6 +3,13 @@
     The problem is to find the shortest distance between all pairs of vertices in a
     weighted directed graph that can have negative edge weights.
 """
+from __future__ import annotations
+
+import random
+from itertools import chain, compress, repeat
+from operator import add, lt
+
+INF = float("inf")
 
 
 def _print_dist(dist, v):
@@ -53,4 +60,164 @@ def floyd_warshall(graph, v):
                     dist[i][j] = dist[i][k] + dist[k][j]
 
     _print_dist(dist, v)
-    return dist, v
\ No newline at end of file
+    return dist, v
+
+
+def _initial_matrices(
+    graph: list[list[float]], with_next_hop: bool
+) -> tuple[list[list[float]], list[list[int]] | None]:
+    dist = [list(row) for row in graph]
+    if not with_next_hop:
+        return dist, None
+    next_hop = [
+        [j if (i == j or weight != INF) else -1 for j, weight in enumerate(row)]
+        for i, row in enumerate(graph)
+    ]
+    return dist, next_hop
+
+
+def _relax_row(
+    dist: list[list[float]],
+    next_hop: list[list[int]] | None,
+    i: int,
+    k: int,
+    start: int,
+    stop: int,
+) -> None:
+    """
+    dist[i][j] = min(dist[i][j], dist[i][k] + dist[k][j]) for j in start..stop - 1,
+    done with C level map calls over row slices instead of a Python loop over j.
+    """
+    via = dist[i][k]
+    if via == INF:
+        return
+    row = dist[i]
+    candidate = list(map(add, repeat(via, stop - start), dist[k][start:stop]))
+    # Comparing is cheap in C; only the few improved entries are written back.
+    improved = compress(range(start, stop), map(lt, candidate, row[start:stop]))
+    if next_hop is None:
+        for j in improved:
+            row[j] = candidate[j - start]
+    else:
+        hop, row_next = next_hop[i][k], next_hop[i]
+        for j in improved:
+            row[j] = candidate[j - start]
+            row_next[j] = hop
+
+
+def floyd_warshall_rows(
+    graph: list[list[float]], with_next_hop: bool = False
+) -> tuple[list[list[float]], list[list[int]] | None]:
+    """
+    Floyd-Warshall that relaxes a whole row at a time for every intermediate
+    vertex k.  graph is the same weight matrix floyd_warshall takes, with INF for
+    missing edges.  Returns the distance matrix and, when with_next_hop is set, a
+    next-hop matrix for floyd_warshall_path (otherwise None).  Nothing is printed.
+
+    >>> graph = [[0, 3, INF, 7], [8, 0, 2, INF], [5, INF, 0, 1], [2, INF, INF, 0]]
+    >>> dist, next_hop = floyd_warshall_rows(graph, with_next_hop=True)
+    >>> dist
+    [[0, 3, 5, 6], [5, 0, 2, 3], [3, 6, 0, 1], [2, 5, 7, 0]]
+    >>> floyd_warshall_path(next_hop, 1, 0)
+    [1, 2, 3, 0]
+    >>> floyd_warshall_rows([[0, INF], [INF, 0]])
+    ([[0, inf], [inf, 0]], None)
+    """
+    num_vertices = len(graph)
+    dist, next_hop = _initial_matrices(graph, with_next_hop)
+    for k in range(num_vertices):
+        for i in range(num_vertices):
+            _relax_row(dist, next_hop, i, k, 0, num_vertices)
+    return dist, next_hop
+
+
+def floyd_warshall_blocked(
+    graph: list[list[float]], block_size: int = 64, with_next_hop: bool = False
+) -> tuple[list[list[float]], list[list[int]] | None]:
+    """
+    Tiled Floyd-Warshall: for every block of intermediate vertices the diagonal
+    tile is closed first, then the tiles in its block row and block column, then
+    every remaining tile, so each pass only touches block_size wide row slices.
+    Same results and return value as floyd_warshall_rows.
+
+    >>> graph = [[0, 3, INF, 7], [8, 0, 2, INF], [5, INF, 0, 1], [2, INF, INF, 0]]
+    >>> floyd_warshall_blocked(graph, block_size=3) == floyd_warshall_rows(graph)
+    True
+    >>> graph = random_weight_matrix(40, seed=2)
+    >>> dist, next_hop = floyd_warshall_blocked(graph, 16, with_next_hop=True)
+    >>> dist == floyd_warshall_rows(graph)[0]
+    True
+    >>> path = floyd_warshall_path(next_hop, 0, 39)
+    >>> sum(graph[u][v] for u, v in zip(path, path[1:])) == dist[0][39]
+    True
+    """
+    if block_size < 1:
+        raise ValueError("block_size must be positive")
+    num_vertices = len(graph)
+    dist, next_hop = _initial_matrices(graph, with_next_hop)
+    blocks = [
+        (start, min(start + block_size, num_vertices))
+        for start in range(0, num_vertices, block_size)
+    ]
+    for pivot_start, pivot_stop in blocks:
+        pivot = range(pivot_start, pivot_stop)
+        others = [block for block in blocks if block[0] != pivot_start]
+        # Phase 1: the diagonal tile.
+        for k in pivot:
+            for i in pivot:
+                _relax_row(dist, next_hop, i, k, pivot_start, pivot_stop)
+        # Phase 2: tiles sharing a block row or block column with the diagonal.
+        for k in pivot:
+            for i in pivot:
+                for start, stop in others:
+                    _relax_row(dist, next_hop, i, k, start, stop)
+            for i in chain.from_iterable(range(*block) for block in others):
+                _relax_row(dist, next_hop, i, k, pivot_start, pivot_stop)
+        # Phase 3: all remaining tiles, which only read the two finished panels.
+        for row_start, row_stop in others:
+            for start, stop in others:
+                for k in pivot:
+                    for i in range(row_start, row_stop):
+                        _relax_row(dist, next_hop, i, k, start, stop)
+    return dist, next_hop
+
+
+def floyd_warshall_path(next_hop: list[list[int]], start: int, end: int) -> list[int]:
+    """
+    Rebuild a shortest path from a next-hop matrix; [] when end is unreachable.
+
+    >>> floyd_warshall_path([[0, -1], [-1, 1]], 0, 1)
+    []
+    """
+    if next_hop[start][end] == -1:
+        return []
+    path = [start]
+    while start != end:
+        start = next_hop[start][end]
+        path.append(start)
+    return path
+
+
+def random_weight_matrix(
+    num_vertices: int, density: float = 0.3, seed: int | None = None
+) -> list[list[float]]:
+    """
+    Random non-negative weight matrix in the format floyd_warshall expects.
+
+    >>> graph = random_weight_matrix(30, seed=1)
+    >>> import contextlib, io
+    >>> with contextlib.redirect_stdout(io.StringIO()):
+    ...     expected, _ = floyd_warshall(graph, len(graph))
+    >>> floyd_warshall_rows(graph)[0] == expected
+    True
+    >>> floyd_warshall_blocked(graph, block_size=8)[0] == expected
+    True
+    """
+    rng = random.Random(seed)
+    return [
+        [
+            0 if i == j else (rng.randint(1, 50) if rng.random() < density else INF)
+            for j in range(num_vertices)
+        ]
+        for i in range(num_vertices)
+    ]
@@ -6,9 +6,6 @@ URL: https://mathworld.wolfram.com/MinimumVertexCover.html
 URL: https://cs.stackexchange.com/questions/129017/greedy-algorithm-for-vertex-cover
 """
 
-import heapq
-
-
 def greedy_min_vertex_cover(graph: dict) -> set[int]:
     """
     Greedy APX Algorithm for min Vertex Cover
@@ -17,39 +14,80 @@ def greedy_min_vertex_cover(graph: dict) -> set[int]:
     @example:
     >>> graph = {0: [1, 3], 1: [0, 3], 2: [0, 3, 4], 3: [0, 1, 2], 4: [2, 3]}
     >>> greedy_min_vertex_cover(graph)
-    {0, 1, 2, 4}
+    {1, 2, 3}
+    >>> graph
+    {0: [1, 3], 1: [0, 3], 2: [0, 3, 4], 3: [0, 1, 2], 4: [2, 3]}
+
+    Both this and the heap version it replaced take 2 first, after which 0, 1
+    and 3 tie at rank 2.  The heap took the smallest vertex, 0, and ended with
+    {0, 1, 2, 4}; here ties go to the vertex that entered its bucket last, 3,
+    which covers the remaining edges with one vertex less.
+
+    A neighbour listed more than once is still one edge:
+    >>> greedy_min_vertex_cover({0: [1, 1, 1, 1], 1: [0, 2, 4], 2: [1], 4: [1]})
+    {1}
     """
-    # queue used to store nodes and their rank
-    queue: list[list] = []
+    # Vertices are kept in buckets by their number of uncovered edges (rank):
+    # bucket[r] is a doubly linked list threaded through next_in/prev_in, so
+    # moving a vertex to the next lower bucket is O(1) and the vertex with max
+    # rank is found by walking a pointer down from the largest rank.  Ties go
+    # to the vertex that entered its bucket last.
+    vertices = list(graph)
+    index = {vertex: i for i, vertex in enumerate(vertices)}
+    num_vertices = len(vertices)
+    # distinct neighbours, so a repeated entry is one edge
+    neighbours = [dict.fromkeys(graph[vertex]) for vertex in vertices]
+    rank = [len(distinct) for distinct in neighbours]
+    # pointers to vertices that have vertex in their adjacency list
+    incoming: list[list[int]] = [[] for _ in range(num_vertices)]
+    for i, distinct in enumerate(neighbours):
+        for neighbour in distinct:
+            if neighbour in index:
+                incoming[index[neighbour]].append(i)
 
-    # for each node and his adjacency list add them and the rank of the node to queue
-    # using heapq module the queue will be filled like a Priority Queue
-    # heapq works with a min priority queue, so I used -1*len(v) to build it
-    for key, value in graph.items():
-        # O(log(n))
-        heapq.heappush(queue, [-1 * len(value), (key, value)])
+    max_rank = max(rank, default=0)
+    head = [-1] * (max_rank + 1)
+    next_in = [-1] * num_vertices
+    prev_in = [-1] * num_vertices
+
+    def unlink(i: int) -> None:
+        if prev_in[i] == -1:
+            head[rank[i]] = next_in[i]
+        else:
+            next_in[prev_in[i]] = next_in[i]
+        if next_in[i] != -1:
+            prev_in[next_in[i]] = prev_in[i]
+
+    def link(i: int) -> None:
+        # insert at the head of its bucket
+        first = head[rank[i]]
+        prev_in[i], next_in[i] = -1, first
+        if first != -1:
+            prev_in[first] = i
+        head[rank[i]] = i
+
+    for i in reversed(range(num_vertices)):
+        link(i)
 
     # chosen_vertices = set of chosen vertices
     chosen_vertices = set()
+    chosen = [False] * num_vertices
+
+    # while there are still edges, take the vertex with max rank
+    while max_rank > 0:
+        argmax = head[max_rank]
+        if argmax == -1:
+            max_rank -= 1
+            continue
+        unlink(argmax)
+        chosen[argmax] = True
+        chosen_vertices.add(vertices[argmax])
 
-    # while queue isn't empty and there are still edges
-    #   (queue[0][0] is the rank of the node with max rank)
-    while queue and queue[0][0] != 0:
-        # extract vertex with max rank from queue and add it to chosen_vertices
-        argmax = heapq.heappop(queue)[1][0]
-        chosen_vertices.add(argmax)
-
-        # Remove all arcs adjacent to argmax
-        for elem in queue:
-            # if v haven't adjacent node, skip
-            if elem[0] == 0:
-                continue
-            # if argmax is reachable from elem
-            # remove argmax from elem's adjacent list and update his rank
-            if argmax in elem[1][1]:
-                index = elem[1][1].index(argmax)
-                del elem[1][1][index]
-                elem[0] += 1
-        # re-order the queue
-        heapq.heapify(queue)
-    return chosen_vertices
\ No newline at end of file
+        # Remove all arcs adjacent to argmax: one less rank for each vertex
+        # listing it
+        for i in incoming[argmax]:
+            if not chosen[i] and rank[i] > 0:
+                unlink(i)
+                rank[i] -= 1
+                link(i)
+    return chosen_vertices
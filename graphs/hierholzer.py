@@ -0,0 +1,183 @@
+"""
+Eulerian paths and circuits with Hierholzer's algorithm.
+
+https://en.wikipedia.org/wiki/Eulerian_path#Hierholzer's_algorithm
+
+eulerian_path_and_circuit_for_undirected_graph.py marks used edges in a V x V
+matrix, so it needs O(V^2) memory, cannot tell parallel edges apart and recurses
+once per edge.  Here edge i of the input is identified by its index: the
+adjacency arrays of a ``csr_graph.CSRGraph`` store the edge id of every arc as its
+weight, used edges are flagged in a bytearray of E bytes and the walk keeps an
+explicit stack, so time and memory are O(V + E) on directed and undirected
+multigraphs, self loops included.
+
+>>> bridges = [(0, 1), (0, 1), (0, 2), (0, 2), (0, 3), (1, 3), (2, 3)]
+>>> eulerian_path(4, bridges)  # the seven bridges of Konigsberg
+>>> eulerian_path(4, bridges[1:])
+[2, 0, 1, 3, 0, 2, 3]
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from timeit import timeit
+
+from graphs.csr_graph import CSRGraph
+
+
+def _degree_balance(
+    num_vertices: int, edges: list[tuple[int, int]], directed: bool
+) -> list[int]:
+    """Out minus in degree when directed, degree modulo 2 when undirected."""
+    balance = [0] * num_vertices
+    for u, v in edges:
+        balance[u] += 1
+        balance[v] += -1 if directed else 1
+    if not directed:
+        balance = [degree % 2 for degree in balance]
+    return balance
+
+
+def _start_vertex(
+    num_vertices: int, edges: list[tuple[int, int]], directed: bool, closed: bool
+) -> int:
+    """Where an Euler path has to start, or -1 when the degrees rule one out."""
+    balance = _degree_balance(num_vertices, edges, directed)
+    if directed:
+        starts = [v for v in range(num_vertices) if balance[v] == 1]
+        unbalanced = [v for v in range(num_vertices) if balance[v] not in (0, 1, -1)]
+        if unbalanced or len(starts) > 1 or (closed and starts):
+            return -1
+    else:
+        starts = [v for v in range(num_vertices) if balance[v]]
+        if len(starts) > 2 or (closed and starts):
+            return -1
+    return starts[0] if starts else edges[0][0]
+
+
+def hierholzer(
+    num_vertices: int,
+    edges: list[tuple[int, int]],
+    start: int,
+    directed: bool = False,
+) -> tuple[list[int], list[int]]:
+    """
+    Vertices and edge ids of the walk from start that Hierholzer's algorithm
+    builds.  It uses every edge exactly once when the degrees allow an Euler path
+    from start and all edges lie in one connected component; otherwise it covers
+    fewer than len(edges) edges.
+
+    >>> hierholzer(3, [(0, 1), (1, 2), (2, 0), (0, 0)], 0, directed=True)
+    ([0, 1, 2, 0, 0], [0, 1, 2, 3])
+    """
+    graph = CSRGraph.from_edges(
+        num_vertices,
+        [(u, v, edge_id) for edge_id, (u, v) in enumerate(edges)],
+        directed=directed,
+    )
+    indptr, heads, edge_ids = graph.indptr, graph.indices, graph.weights
+    used = bytearray(len(edges))
+    pointer = array("q", indptr)
+    vertex_stack = [start]
+    edge_stack = [-1]
+    vertices: list[int] = []
+    walk_edges: list[int] = []
+    while vertex_stack:
+        u = vertex_stack[-1]
+        arc, end = pointer[u], indptr[u + 1]
+        while arc < end and used[edge_ids[arc]]:
+            arc += 1  # the other end of an undirected edge already walked
+        if arc < end:
+            pointer[u] = arc + 1
+            edge_id = edge_ids[arc]
+            used[edge_id] = 1
+            vertex_stack.append(heads[arc])
+            edge_stack.append(edge_id)
+        else:
+            # u is stuck: it goes to the output, which is built back to front
+            pointer[u] = arc
+            vertices.append(vertex_stack.pop())
+            walk_edges.append(edge_stack.pop())
+    vertices.reverse()
+    walk_edges.pop()
+    walk_edges.reverse()
+    return vertices, walk_edges
+
+
+def eulerian_path(
+    num_vertices: int,
+    edges: list[tuple[int, int]],
+    directed: bool = False,
+    closed: bool = False,
+) -> list[int] | None:
+    """
+    Vertices of a walk that uses every edge exactly once (a circuit when closed
+    is True), or None when there is none.  A graph without edges has the empty
+    path.
+
+    >>> triangle = [(0, 1), (1, 2), (2, 0)]
+    >>> eulerian_path(3, triangle, closed=True), eulerian_path(3, triangle[:2])
+    ([0, 1, 2, 0], [0, 1, 2])
+    >>> eulerian_path(3, triangle[:2], closed=True) is None
+    True
+    >>> eulerian_path(4, [(0, 1), (1, 0), (2, 3), (3, 2)], directed=True) is None
+    True
+    >>> eulerian_path(3, [(0, 1), (2, 1)], directed=True) is None
+    True
+    """
+    if not edges:
+        return []
+    start = _start_vertex(num_vertices, edges, directed, closed)
+    if start == -1:
+        return None
+    vertices, walk_edges = hierholzer(num_vertices, edges, start, directed)
+    # edges left over sit in another component
+    return vertices if len(walk_edges) == len(edges) else None
+
+
+def eulerian_circuit(
+    num_vertices: int, edges: list[tuple[int, int]], directed: bool = False
+) -> list[int] | None:
+    """
+    >>> eulerian_circuit(3, [(0, 1), (1, 2), (2, 0), (0, 1), (1, 0)])
+    [0, 1, 2, 0, 1, 0]
+    """
+    return eulerian_path(num_vertices, edges, directed, closed=True)
+
+
+def random_eulerian_edges(
+    num_vertices: int, num_edges: int, seed: int = 0
+) -> list[tuple[int, int]]:
+    """
+    The edges of a random closed walk of num_edges steps, so the multigraph they
+    form always has an Euler circuit.
+
+    >>> edges = random_eulerian_edges(5, 12)
+    >>> len(edges), eulerian_circuit(5, edges, directed=True) is not None
+    (12, True)
+    """
+    rng = random.Random(seed)
+    walk = [rng.randrange(num_vertices) for _ in range(num_edges)]
+    return list(zip(walk, walk[1:] + walk[:1]))
+
+
+def benchmark(
+    num_vertices: int = 100_000, num_edges: int = 1_000_000
+) -> dict[str, float]:
+    """
+    Seconds for an Euler circuit of one random multigraph, read as directed and as
+    undirected.  Raises AssertionError if a circuit misses an edge.
+
+    >>> sorted(benchmark(20, 100))
+    ['directed', 'undirected']
+    """
+    edges = random_eulerian_edges(num_vertices, num_edges)
+    results = {}
+    for name, directed in (("directed", True), ("undirected", False)):
+        circuit = eulerian_circuit(num_vertices, edges, directed)
+        assert circuit is not None and len(circuit) == num_edges + 1, name
+        results[name] = timeit(
+            lambda directed=directed: eulerian_circuit(num_vertices, edges, directed),
+            number=1,
+        )
+    return results
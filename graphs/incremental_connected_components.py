@@ -0,0 +1,117 @@
+"""
+https://en.wikipedia.org/wiki/Dynamic_connectivity#Incremental_connectivity
+
+Online connected components for a graph that only ever gains edges.
+
+connected_components.py recomputes every component with a DFS from scratch.  When
+edges arrive as a stream it is much cheaper to merge components as each edge comes
+in: the components are the sets of a DisjointSet (union by rank and path
+compression), so every edge, same_component and component_size call costs
+amortised O(alpha(n)), which is constant for any realistic n.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from data_structures.disjoint_set.alternate_disjoint_set import DisjointSet
+
+
+class IncrementalConnectivity:
+    """
+    >>> stream = IncrementalConnectivity(7)
+    >>> stream.add_edges([(0, 1), (1, 3), (2, 3)])
+    3
+    >>> stream.same_component(0, 2), stream.same_component(0, 4)
+    (True, False)
+    >>> stream.component_size(3), stream.num_components
+    (4, 4)
+    >>> stream.add_edges([(4, 5), (5, 6), (6, 4), (0, 2)])
+    2
+    >>> stream.components()
+    [[0, 1, 2, 3], [4, 5, 6]]
+    >>> stream.largest_component_size
+    4
+
+    Vertices that appear for the first time in an edge are added on the fly.
+
+    >>> stream.add_edge(6, 9)
+    True
+    >>> stream.num_vertices, stream.num_components, stream.component_size(8)
+    (10, 4, 1)
+    """
+
+    def __init__(self, num_vertices: int = 0) -> None:
+        self.sets = DisjointSet([])
+        self.num_components = 0
+        self.add_vertices(num_vertices)
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.sets.parents)
+
+    @property
+    def largest_component_size(self) -> int:
+        return self.sets.max_set
+
+    def add_vertices(self, count: int) -> range:
+        """
+        Add count isolated vertices and return their ids.
+
+        >>> IncrementalConnectivity(2).add_vertices(3)
+        range(2, 5)
+        """
+        self.num_components += count
+        return self.sets.add_sets([1] * count)
+
+    def add_edge(self, u: int, v: int) -> bool:
+        """Insert the edge u-v; True if it joined two different components."""
+        highest = max(u, v)
+        if highest >= self.num_vertices:
+            self.add_vertices(highest + 1 - self.num_vertices)
+        if self.sets.merge(u, v):
+            self.num_components -= 1
+            return True
+        return False
+
+    def add_edges(self, edges: Iterable[tuple[int, int]]) -> int:
+        """Insert a batch of edges and return how many components were merged."""
+        return sum(self.add_edge(u, v) for u, v in edges)
+
+    def component_id(self, vertex: int) -> int:
+        """
+        Representative vertex of the component; it may change after later merges.
+        """
+        return self.sets.get_parent(vertex)
+
+    def same_component(self, u: int, v: int) -> bool:
+        return self.sets.get_parent(u) == self.sets.get_parent(v)
+
+    def component_size(self, vertex: int) -> int:
+        return self.sets.set_counts[self.sets.get_parent(vertex)]
+
+    def snapshot(self) -> list[int]:
+        """
+        Current partition as one component id per vertex, numbered 0, 1, ... in
+        order of each component's smallest vertex.  Later edges do not change a
+        snapshot that was already taken.
+
+        >>> stream = IncrementalConnectivity(5)
+        >>> stream.add_edges([(3, 1), (4, 0)])
+        2
+        >>> stream.snapshot()
+        [0, 1, 2, 1, 0]
+        """
+        labels: dict[int, int] = {}
+        return [
+            labels.setdefault(self.sets.get_parent(vertex), len(labels))
+            for vertex in range(self.num_vertices)
+        ]
+
+    def components(self) -> list[list[int]]:
+        """Vertex lists of every component, ordered by their smallest vertex."""
+        groups: list[list[int]] = []
+        for vertex, label in enumerate(self.snapshot()):
+            if label == len(groups):
+                groups.append([])
+            groups[label].append(vertex)
+        return groups
@@ -0,0 +1,319 @@
+"""
+Recursion-free depth first search algorithms.
+
+https://en.wikipedia.org/wiki/Depth-first_search#Pseudocode
+
+The recursive versions in this directory (articulation_points.py,
+finding_bridges.py, tarjans_scc.py, check_cycle.py, depth_first_search_2.py) make
+one Python call per vertex and raise RecursionError on path-like graphs with more
+than about a thousand vertices.  Here every DFS keeps an explicit stack of
+(vertex, neighbour iterator) frames, so the depth is limited only by memory.
+Neighbours are visited in adjacency order, which makes the results identical to the
+recursive forms.
+
+Every function takes a graph whose vertices are 0 .. n - 1: a dict of adjacency
+lists, a list of lists or a csr_graph.CSRGraph.
+
+>>> path = {v: [v + 1] for v in range(100_000)}
+>>> path[100_000] = []
+>>> len(depth_first_order(path)[0]), has_cycle(path)
+(100001, False)
+>>> len(tarjan_scc(path))
+100001
+>>> undirected = [[u - 1, u + 1] for u in range(100_000)]
+>>> undirected[0], undirected[-1] = [1], [99_998]
+>>> len(bridges(undirected)), len(articulation_points(undirected))
+(99999, 99998)
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Iterable
+from timeit import timeit
+from typing import Any
+
+Graph = Any  # dict[int, list[int]], list[list[int]] or CSRGraph
+
+
+def depth_first_order(
+    graph: Graph, sources: Iterable[int] | None = None
+) -> tuple[list[int], list[int]]:
+    """
+    Preorder and postorder of a DFS started from each vertex in sources in turn
+    (every vertex by default), skipping vertices already reached.
+
+    >>> graph = {0: [1, 2], 1: [3], 2: [3], 3: [], 4: [0]}
+    >>> depth_first_order(graph)
+    ([0, 1, 3, 2, 4], [3, 1, 2, 0, 4])
+    >>> depth_first_order(graph, [4])
+    ([4, 0, 1, 3, 2], [3, 1, 2, 0, 4])
+    """
+    visited = [False] * len(graph)
+    preorder: list[int] = []
+    postorder: list[int] = []
+    for root in range(len(graph)) if sources is None else sources:
+        if visited[root]:
+            continue
+        visited[root] = True
+        preorder.append(root)
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            vertex, neighbours = stack[-1]
+            for neighbour in neighbours:
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    preorder.append(neighbour)
+                    stack.append((neighbour, iter(graph[neighbour])))
+                    break
+            else:
+                stack.pop()
+                postorder.append(vertex)
+    return preorder, postorder
+
+
+def has_cycle(graph: Graph) -> bool:
+    """
+    True if the directed graph contains a cycle (a self loop counts), like
+    check_cycle.check_cycle.
+
+    >>> has_cycle({0: [], 1: [0, 3], 2: [0, 4], 3: [5], 4: [5], 5: []})
+    False
+    >>> has_cycle({0: [1, 2], 1: [2], 2: [0, 3], 3: [3]})
+    True
+    """
+    # 0 = unvisited, 1 = on the current DFS path, 2 = finished
+    state = bytearray(len(graph))
+    for root in range(len(graph)):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            vertex, neighbours = stack[-1]
+            for neighbour in neighbours:
+                mark = state[neighbour]
+                if mark == 0:
+                    state[neighbour] = 1
+                    stack.append((neighbour, iter(graph[neighbour])))
+                    break
+                if mark == 1:
+                    return True
+            else:
+                stack.pop()
+                state[vertex] = 2
+    return False
+
+
+def tarjan_scc(graph: Graph) -> list[list[int]]:
+    """
+    Strongly connected components in the order and vertex order returned by
+    tarjans_scc.tarjan.
+
+    >>> from graphs.tarjans_scc import create_graph, tarjan
+    >>> edges = [(0, 1), (0, 3), (1, 2), (1, 4), (2, 0), (2, 5), (3, 0), (4, 5),
+    ...          (4, 6), (5, 2), (6, 4), (7, 5), (7, 6)]
+    >>> graph = create_graph(8, edges)
+    >>> tarjan_scc(graph)
+    [[3, 6, 4, 5, 2, 1, 0], [7]]
+    >>> tarjan_scc(graph) == tarjan(graph)
+    True
+    """
+    n = len(graph)
+    index_of = [-1] * n
+    lowlink_of = [-1] * n
+    on_stack = [False] * n
+    component_stack: list[int] = []
+    components: list[list[int]] = []
+    index = 0
+    for root in range(n):
+        if index_of[root] != -1:
+            continue
+        index_of[root] = lowlink_of[root] = index
+        index += 1
+        component_stack.append(root)
+        on_stack[root] = True
+        stack = [(root, iter(graph[root]))]
+        while stack:
+            vertex, neighbours = stack[-1]
+            for neighbour in neighbours:
+                if index_of[neighbour] == -1:
+                    index_of[neighbour] = lowlink_of[neighbour] = index
+                    index += 1
+                    component_stack.append(neighbour)
+                    on_stack[neighbour] = True
+                    stack.append((neighbour, iter(graph[neighbour])))
+                    break
+                if on_stack[neighbour] and lowlink_of[neighbour] < lowlink_of[vertex]:
+                    lowlink_of[vertex] = lowlink_of[neighbour]
+            else:
+                stack.pop()
+                if lowlink_of[vertex] == index_of[vertex]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == vertex:
+                            break
+                    components.append(component)
+                if stack:
+                    parent = stack[-1][0]
+                    lowlink_of[parent] = min(lowlink_of[parent], lowlink_of[vertex])
+    return components
+
+
+def bridges(graph: Graph) -> list[tuple[int, int]]:
+    """
+    Bridges of an undirected graph as (a, b) with a <= b, in the order returned by
+    finding_bridges.compute_bridges.
+
+    >>> graph = {0: [1, 2], 1: [0, 2], 2: [0, 1, 3, 5], 3: [2, 4], 4: [3],
+    ...          5: [2, 6, 8], 6: [5, 7], 7: [6, 8], 8: [5, 7]}
+    >>> bridges(graph)
+    [(3, 4), (2, 3), (2, 5)]
+    >>> bridges({})
+    []
+    """
+    n = len(graph)
+    # low[v] is the smallest DFS depth reachable from v's subtree.
+    low = [0] * n
+    visited = [False] * n
+    result: list[tuple[int, int]] = []
+    for root in range(n):
+        if visited[root]:
+            continue
+        visited[root] = True
+        low[root] = 0
+        # frames are (vertex, parent, depth of its children, neighbour iterator)
+        stack = [(root, -1, 1, iter(graph[root]))]
+        while stack:
+            vertex, parent, child_depth, neighbours = stack[-1]
+            for neighbour in neighbours:
+                if neighbour == parent:
+                    continue
+                if not visited[neighbour]:
+                    visited[neighbour] = True
+                    low[neighbour] = child_depth
+                    stack.append(
+                        (neighbour, vertex, child_depth + 1, iter(graph[neighbour]))
+                    )
+                    break
+                low[vertex] = min(low[vertex], low[neighbour])
+            else:
+                stack.pop()
+                if stack:
+                    low[parent] = min(low[parent], low[vertex])
+                    if child_depth - 1 <= low[vertex]:
+                        result.append(
+                            (parent, vertex) if parent < vertex else (vertex, parent)
+                        )
+    return result
+
+
+def articulation_points(graph: Graph) -> list[int]:
+    """
+    Articulation points of an undirected graph in increasing order, found with
+    discovery times and low links (Hopcroft and Tarjan).
+
+    >>> graph = {0: [1, 2], 1: [0, 2], 2: [0, 1, 3, 5], 3: [2, 4], 4: [3],
+    ...          5: [2, 6, 8], 6: [5, 7], 7: [6, 8], 8: [5, 7]}
+    >>> articulation_points(graph)
+    [2, 3, 5]
+    >>> articulation_points({0: [1], 1: [0, 2], 2: [1]})
+    [1]
+    """
+    n = len(graph)
+    discovery = [-1] * n
+    low = [0] * n
+    is_articulation = [False] * n
+    time = 0
+    for root in range(n):
+        if discovery[root] != -1:
+            continue
+        discovery[root] = low[root] = time
+        time += 1
+        root_children = 0
+        stack = [(root, -1, iter(graph[root]))]
+        while stack:
+            vertex, parent, neighbours = stack[-1]
+            for neighbour in neighbours:
+                if neighbour == parent:
+                    continue
+                if discovery[neighbour] == -1:
+                    discovery[neighbour] = low[neighbour] = time
+                    time += 1
+                    stack.append((neighbour, vertex, iter(graph[neighbour])))
+                    break
+                low[vertex] = min(low[vertex], discovery[neighbour])
+            else:
+                stack.pop()
+                if parent == -1:
+                    continue
+                low[parent] = min(low[parent], low[vertex])
+                if parent == root:
+                    root_children += 1
+                elif low[vertex] >= discovery[parent]:
+                    is_articulation[parent] = True
+        is_articulation[root] = root_children > 1
+    return [vertex for vertex in range(n) if is_articulation[vertex]]
+
+
+def _random_undirected_graph(
+    num_vertices: int, num_edges: int, seed: int
+) -> list[list[int]]:
+    rng = random.Random(seed)
+    graph: list[list[int]] = [[] for _ in range(num_vertices)]
+    for _ in range(num_edges):
+        u, v = rng.randrange(num_vertices), rng.randrange(num_vertices)
+        if u != v and v not in graph[u]:
+            graph[u].append(v)
+            graph[v].append(u)
+    return graph
+
+
+def benchmark(
+    num_vertices: int = 500, num_edges: int = 1500, seed: int = 0
+) -> dict[str, tuple[float, float]]:
+    """
+    (recursive, iterative) seconds for each algorithm on one random graph, after
+    checking both forms agree.  Kept small enough for the recursive forms to stay
+    under the default recursion limit.
+
+    >>> sorted(benchmark(60, 150))
+    ['bridges', 'cycle', 'postorder', 'scc']
+    """
+    from graphs import check_cycle, finding_bridges, strongly_connected_components
+    from graphs.tarjans_scc import tarjan
+
+    graph = _random_undirected_graph(num_vertices, num_edges, seed)
+    as_dict = dict(enumerate(graph))
+    directed = {u: [v for v in adjacent if v > u] for u, adjacent in as_dict.items()}
+
+    def recursive_postorder() -> list[int]:
+        visited = [False] * num_vertices
+        order: list[int] = []
+        for vertex in range(num_vertices):
+            if not visited[vertex]:
+                order += strongly_connected_components.topology_sort(
+                    as_dict, vertex, visited
+                )
+        return order
+
+    pairs: dict[str, tuple[Any, Any]] = {
+        "postorder": (recursive_postorder, lambda: depth_first_order(graph)[1]),
+        "bridges": (
+            lambda: finding_bridges.compute_bridges(as_dict),
+            lambda: bridges(graph),
+        ),
+        "scc": (lambda: tarjan(graph), lambda: tarjan_scc(graph)),
+        "cycle": (
+            lambda: check_cycle.check_cycle(directed),
+            lambda: has_cycle(directed),
+        ),
+    }
+    timings = {}
+    for name, (recursive, iterative) in pairs.items():
+        assert recursive() == iterative(), name
+        timings[name] = (timeit(recursive, number=3), timeit(iterative, number=3))
+    return timings
+
@@ -1,7 +1,10 @@
+from collections import deque
+
+
 # Finding longest distance in Directed Acyclic Graph using KahnsAlgorithm
 def longest_distance(graph):
     indegree = [0] * len(graph)
-    queue = []
+    queue = deque()
     long_dist = [1] * len(graph)
 
     for values in graph.values():
@@ -13,7 +16,7 @@ def longest_distance(graph):
             queue.append(i)
 
     while queue:
-        vertex = queue.pop(0)
+        vertex = queue.popleft()
         for x in graph[vertex]:
             indegree[x] -= 1
 
@@ -1,10 +1,13 @@
+from collections import deque
+
+
 def topological_sort(graph):
     """
     Kahn's Algorithm is used to find Topological ordering of Directed Acyclic Graph
     using BFS
     """
     indegree = [0] * len(graph)
-    queue = []
+    queue = deque()
     topo = []
     cnt = 0
 
@@ -17,7 +20,7 @@ def topological_sort(graph):
             queue.append(i)
 
     while queue:
-        vertex = queue.pop(0)
+        vertex = queue.popleft()
         cnt += 1
         topo.append(vertex)
         for x in graph[vertex]:
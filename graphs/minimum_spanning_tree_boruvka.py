@@ -1,3 +1,66 @@
+from __future__ import annotations
+
+from data_structures.disjoint_set.array_disjoint_set import ArrayDisjointSet
+
+
+def boruvka(
+    num_nodes: int, edges: list[tuple[int, int, int]]
+) -> list[tuple[int, int, int]]:
+    """
+    Minimum spanning forest with Boruvka's algorithm, taking and returning edges
+    as (u, v, weight) like minimum_spanning_tree_kruskal.kruskal.
+
+    Equal weights are ordered by (weight, min(u, v), max(u, v), position in
+    edges), so there is no need to make the weights distinct first as
+    Graph.distinct_weight does.  Components live in a flat ArrayDisjointSet and
+    are read into one label array per round; each round is then a single pass over
+    a flat list of edge keys that picks the cheapest edge leaving every component
+    and drops the edges that already have both ends in the same component.  There
+    are at most log2(num_nodes) rounds and no sorting.
+
+    >>> boruvka(4, [(0, 1, 3), (1, 2, 5), (2, 3, 1)])
+    [(0, 1, 3), (2, 3, 1), (1, 2, 5)]
+    >>> edges = [(0, 1, 3), (1, 2, 5), (2, 3, 1), (0, 2, 1), (0, 3, 2), (2, 1, 1)]
+    >>> tree = boruvka(4, edges)
+    >>> tree
+    [(0, 2, 1), (2, 1, 1), (2, 3, 1)]
+    >>> from graphs.minimum_spanning_tree_kruskal import kruskal
+    >>> sum(w for *_, w in tree) == sum(w for *_, w in kruskal(4, edges))
+    True
+    >>> boruvka(5, [(0, 1, 2), (3, 4, 1), (1, 1, 0)])
+    [(0, 1, 2), (3, 4, 1)]
+    """
+    components = ArrayDisjointSet(num_nodes)
+    # (weight, smaller end, larger end, index): comparing keys breaks ties
+    live = [
+        (w, u, v, i) if u < v else (w, v, u, i)
+        for i, (u, v, w) in enumerate(edges)
+        if u != v
+    ]
+    chosen: list[int] = []
+    label = list(range(num_nodes))
+    nothing = (float("inf"),)  # compares greater than every key
+    while live:
+        cheapest = [nothing] * num_nodes
+        kept = []
+        keep = kept.append
+        for key in live:
+            cu = label[key[1]]
+            cv = label[key[2]]
+            if cu == cv:
+                continue
+            keep(key)
+            cheapest[cu] = min(cheapest[cu], key)
+            cheapest[cv] = min(cheapest[cv], key)
+        live = kept
+        # Both ends of an edge may pick it; union reports the first time only.
+        for key in cheapest:
+            if key is not nothing and components.union(key[1], key[2]):
+                chosen.append(key[3])
+        label = components.find_many(range(num_nodes))
+    return [edges[i] for i in chosen]
+
+
 class Graph:
     """
     Data structure to store graphs (based on adjacency lists)
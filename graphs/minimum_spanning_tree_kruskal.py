@@ -1,3 +1,6 @@
+from data_structures.disjoint_set.array_disjoint_set import ArrayDisjointSet
+
+
 def kruskal(
     num_nodes: int, edges: list[tuple[int, int, int]]
 ) -> list[tuple[int, int, int]]:
@@ -14,22 +17,14 @@ def kruskal(
     """
     edges = sorted(edges, key=lambda edge: edge[2])
 
-    parent = list(range(num_nodes))
-
-    def find_parent(i):
-        if i != parent[i]:
-            parent[i] = find_parent(parent[i])
-        return parent[i]
+    components = ArrayDisjointSet(num_nodes)
 
     minimum_spanning_tree_cost = 0
     minimum_spanning_tree = []
 
     for edge in edges:
-        parent_a = find_parent(edge[0])
-        parent_b = find_parent(edge[1])
-        if parent_a != parent_b:
+        if components.union(edge[0], edge[1]):
             minimum_spanning_tree_cost += edge[2]
             minimum_spanning_tree.append(edge)
-            parent[parent_a] = parent_b
 
     return minimum_spanning_tree
\ No newline at end of file
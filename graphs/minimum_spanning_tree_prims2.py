@@ -11,6 +11,8 @@ from __future__ import annotations
 from sys import maxsize
 from typing import Generic, TypeVar
 
+from graphs.prim_engine import prim_mst
+
 T = TypeVar("T")
 
 
@@ -230,39 +232,23 @@ def prims_algo(
 
     >>> dist, parent = prims_algo(graph)
 
-    >>> abs(dist["a"] - dist["b"])
-    3
-    >>> abs(dist["d"] - dist["b"])
-    15
-    >>> abs(dist["a"] - dist["c"])
-    13
+    dist[node] is the weight of the tree edge from parent[node] to node.
+
+    >>> dist
+    {'a': 0, 'b': 3, 'c': 10, 'd': 5}
+    >>> parent
+    {'a': None, 'b': 'a', 'c': 'b', 'd': 'c'}
     """
-    # prim's algorithm for minimum spanning tree
+    # prim's algorithm for minimum spanning tree, grown by prim_engine.prim_mst
     dist: dict[T, int] = {node: maxsize for node in graph.connections}
     parent: dict[T, T | None] = {node: None for node in graph.connections}
-
-    priority_queue: MinPriorityQueue[T] = MinPriorityQueue()
-    for node, weight in dist.items():
-        priority_queue.push(node, weight)
-
-    if priority_queue.is_empty():
+    if not graph.connections:
         return dist, parent
 
-    # initialization
-    node = priority_queue.extract_min()
-    dist[node] = 0
-    for neighbour in graph.connections[node]:
-        if dist[neighbour] > dist[node] + graph.connections[node][neighbour]:
-            dist[neighbour] = dist[node] + graph.connections[node][neighbour]
-            priority_queue.update_key(neighbour, dist[neighbour])
-            parent[neighbour] = node
-
-    # running prim's algorithm
-    while not priority_queue.is_empty():
-        node = priority_queue.extract_min()
-        for neighbour in graph.connections[node]:
-            if dist[neighbour] > dist[node] + graph.connections[node][neighbour]:
-                dist[neighbour] = dist[node] + graph.connections[node][neighbour]
-                priority_queue.update_key(neighbour, dist[neighbour])
-                parent[neighbour] = node
+    tree = prim_mst(graph.connections)
+    labels = tree.graph.labels or list(graph.connections)
+    for vertex, node in enumerate(labels):
+        dist[node] = tree.key[vertex]
+        if tree.parent[vertex] != -1:
+            parent[node] = labels[tree.parent[vertex]]
     return dist, parent
@@ -5,10 +5,10 @@
     Details: https://en.wikipedia.org/wiki/Prim%27s_algorithm
 """
 
-import heapq as hq
-import math
 from collections.abc import Iterator
 
+from graphs.prim_engine import prim_mst
+
 
 class Vertex:
     """Class Vertex."""
@@ -53,31 +53,39 @@ def connect(graph, a, b, edge):
     graph[b - 1].add_edge(graph[a - 1], edge)
 
 
+def _run_prim(graph: list, root: Vertex) -> None:
+    """
+    Set key and pi of every vertex with prim_engine.prim_mst: key is the weight of
+    the edge to the parent pi, 0 for the root.
+    """
+    position = {vertex.id: i for i, vertex in enumerate(graph)}
+    rows = [[(position[v.id], u.edges[v.id]) for v in u.neighbors] for u in graph]
+    tree = prim_mst(rows, root=position[root.id])
+    for i, u in enumerate(graph):
+        u.key = tree.key[i]
+        u.pi = graph[tree.parent[i]] if tree.parent[i] != -1 else None
+
+
 def prim(graph: list, root: Vertex) -> list:
     """Prim's Algorithm.
 
     Runtime:
-        O(mn) with `m` edges and `n` vertices
+        O((m + n)log m) with `m` edges and `n` vertices
 
     Return:
         List with the edges of a Minimum Spanning Tree
 
     Usage:
         prim(graph, graph[0])
+
+    >>> graph = [Vertex(n) for n in range(5)]
+    >>> for a, b, weight in [(1, 2, 3), (1, 3, 1), (2, 3, 1), (3, 4, 7), (4, 5, 2)]:
+    ...     connect(graph, a, b, weight)
+    >>> prim(graph, graph[0])
+    [(2, 3), (3, 1), (4, 3), (5, 4)]
     """
     a = []
-    for u in graph:
-        u.key = math.inf
-        u.pi = None
-    root.key = 0
-    q = graph[:]
-    while q:
-        u = min(q)
-        q.remove(u)
-        for v in u.neighbors:
-            if (v in q) and (u.edges[v.id] < v.key):
-                v.pi = u
-                v.key = u.edges[v.id]
+    _run_prim(graph, root)
     for i in range(1, len(graph)):
         a.append((int(graph[i].id) + 1, int(graph[i].pi.id) + 1))
     return a
@@ -87,29 +95,20 @@ def prim_heap(graph: list, root: Vertex) -> Iterator[tuple]:
     """Prim's Algorithm with min heap.
 
     Runtime:
-        O((m + n)log n) with `m` edges and `n` vertices
+        O((m + n)log m) with `m` edges and `n` vertices
 
     Yield:
         Edges of a Minimum Spanning Tree
 
     Usage:
         prim(graph, graph[0])
-    """
-    for u in graph:
-        u.key = math.inf
-        u.pi = None
-    root.key = 0
-
-    h = list(graph)
-    hq.heapify(h)
-
-    while h:
-        u = hq.heappop(h)
-        for v in u.neighbors:
-            if (v in h) and (u.edges[v.id] < v.key):
-                v.pi = u
-                v.key = u.edges[v.id]
-                hq.heapify(h)
 
+    >>> graph = [Vertex(n) for n in range(5)]
+    >>> for a, b, weight in [(1, 2, 3), (1, 3, 1), (2, 3, 1), (3, 4, 7), (4, 5, 2)]:
+    ...     connect(graph, a, b, weight)
+    >>> list(prim_heap(graph, graph[0]))
+    [(2, 3), (3, 1), (4, 3), (5, 4)]
+    """
+    _run_prim(graph, root)
     for i in range(1, len(graph)):
-        yield (int(graph[i].id) + 1, int(graph[i].pi.id) + 1)
\ No newline at end of file
+        yield (int(graph[i].id) + 1, int(graph[i].pi.id) + 1)
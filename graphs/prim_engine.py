@@ -0,0 +1,309 @@
+"""
+Prim's minimum spanning tree algorithm with a choice of priority queue.
+
+https://en.wikipedia.org/wiki/Prim%27s_algorithm#Time_complexity
+
+prim.py, minimum_spanning_tree_prims.py and minimum_spanning_tree_prims2.py each
+bring their own queue; they are now thin wrappers around ``prim_mst``, which runs
+on a ``csr_graph.CSRGraph`` and offers three strategies:
+
+* ``"lazy"``: ``heapq`` of (weight, vertex) entries.  A cheaper edge pushes a new
+  entry and stale ones are skipped when popped, so the heap may hold O(E) entries
+  but every operation is a C-level ``heapq`` call.  O(E log E).
+* ``"indexed"``: an indexed d-ary heap holding each vertex at most once with
+  O(log_d V) decrease-key.  O(E log_d V) time and O(V) heap memory.
+* ``"array"``: no heap at all, the cheapest vertex is found by scanning the key
+  list, as prim.py used to.  O(V^2), the classic choice for dense graphs.
+
+Use ``benchmark`` to pick one.  In CPython the lazy heap is fastest on sparse
+graphs (about twice the indexed heap at 4 edges per vertex) and still slightly
+ahead on dense ones, where the edge loop dominates and all three end up within
+30% of each other; on dense graphs the indexed heap is the one to use when the
+O(E) entries of the lazy heap do not fit in memory.
+
+Dicts of ``[(neighbour, weight), ...]`` lists or of ``{neighbour: weight}`` rows,
+and lists of such rows, are converted on the way in; an undirected graph lists
+every edge from both ends.  A disconnected graph gets a minimum spanning forest.
+
+>>> graph = {0: [[1, 1], [3, 3]], 1: [[0, 1], [2, 6], [3, 5], [4, 1]],
+...          2: [[1, 6], [4, 5], [5, 2]], 3: [[0, 3], [1, 5], [4, 1]],
+...          4: [[1, 1], [2, 5], [3, 1], [5, 4]], 5: [[2, 2], [4, 4]]}
+>>> [prim_mst(graph, strategy=s).total_weight for s in ("lazy", "indexed", "array")]
+[9, 9, 9]
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections.abc import Hashable
+from heapq import heappop, heappush
+from math import inf
+from timeit import timeit
+from typing import Any
+
+from graphs.csr_graph import CSRGraph
+from graphs.dijkstra_binary_heap import IndexedMinHeap
+
+STRATEGIES = ("lazy", "indexed", "array")
+
+
+class IndexedDaryHeap(IndexedMinHeap):
+    """
+    IndexedMinHeap with ``arity`` children per node: a shallower tree makes
+    decrease-key cheaper at the price of more comparisons per pop.
+
+    >>> heap = IndexedDaryHeap(6, arity=4)
+    >>> for key, priority in [(0, 7), (1, 3), (2, 9), (3, 5), (4, 8)]:
+    ...     heap.push(key, priority)
+    >>> heap.decrease_key(2, 1)
+    >>> [heap.pop() for _ in range(len(heap))]
+    [(2, 1), (1, 3), (3, 5), (0, 7), (4, 8)]
+    """
+
+    def __init__(self, capacity: int, arity: int = 4) -> None:
+        super().__init__(capacity)
+        self.arity = arity
+
+    def _sift_up(self, index: int) -> None:
+        heap, position, priority = self.heap, self.position, self.priority
+        arity = self.arity
+        key = heap[index]
+        key_priority = priority[key]
+        while index > 0:
+            parent_index = (index - 1) // arity
+            parent = heap[parent_index]
+            if priority[parent] <= key_priority:
+                break
+            heap[index] = parent
+            position[parent] = index
+            index = parent_index
+        heap[index] = key
+        position[key] = index
+
+    def _sift_down(self, index: int) -> None:
+        heap, position, priority = self.heap, self.position, self.priority
+        arity = self.arity
+        size = len(heap)
+        key = heap[index]
+        key_priority = priority[key]
+        first_child = arity * index + 1
+        while first_child < size:
+            child_index = first_child
+            child_priority = priority[heap[first_child]]
+            for other in range(first_child + 1, min(first_child + arity, size)):
+                other_priority = priority[heap[other]]
+                if other_priority < child_priority:
+                    child_index, child_priority = other, other_priority
+            if key_priority <= child_priority:
+                break
+            child = heap[child_index]
+            heap[index] = child
+            position[child] = index
+            index = child_index
+            first_child = arity * index + 1
+        heap[index] = key
+        position[key] = index
+
+
+class SpanningTree:
+    """
+    Result of ``prim_mst``, indexed by vertex id: ``order`` lists the vertices in
+    the order they joined the tree, ``parent[v]`` is -1 for the root of each
+    component and ``key[v]`` is the weight of the edge joining v to its parent.
+    """
+
+    def __init__(
+        self, graph: CSRGraph, order: list[int], parent: array, key: list[Any]
+    ) -> None:
+        self.graph = graph
+        self.order = order
+        self.parent = parent
+        self.key = key
+
+    def _label(self, vertex_id: int) -> Hashable:
+        return vertex_id if self.graph.labels is None else self.graph.labels[vertex_id]
+
+    @property
+    def total_weight(self) -> Any:
+        return sum(self.key[v] for v in self.order if self.parent[v] != -1)
+
+    def edges(self) -> list[tuple[Hashable, Hashable, Any]]:
+        """(parent, vertex, weight) for every tree edge, in the order added."""
+        return [
+            (self._label(self.parent[v]), self._label(v), self.key[v])
+            for v in self.order
+            if self.parent[v] != -1
+        ]
+
+
+def _as_csr(graph: Any) -> CSRGraph:
+    if hasattr(graph, "neighbor_weights"):  # a CSRGraph
+        if graph.weights is None:
+            raise ValueError("Prim's algorithm needs a weighted graph")
+        return graph
+    rows = graph.items() if isinstance(graph, dict) else enumerate(graph)
+    adjacency = {
+        u: list(row.items()) if isinstance(row, dict) else row for u, row in rows
+    }
+    return CSRGraph.from_dict(adjacency, directed=False, weighted=True)
+
+
+def prim_mst(
+    graph: Any,
+    root: Hashable | None = None,
+    strategy: str = "lazy",
+    arity: int = 4,
+) -> SpanningTree:
+    """
+    Minimum spanning forest grown from ``root`` (the first vertex by default); the
+    other components are grown from their smallest vertex id in turn.
+
+    >>> graph = CSRGraph.from_edges(
+    ...     5, [(0, 1, 4), (1, 2, 2), (0, 2, 1), (3, 4, 7)], directed=False
+    ... )
+    >>> tree = prim_mst(graph)
+    >>> tree.edges(), tree.total_weight
+    ([(0, 2, 1), (2, 1, 2), (3, 4, 7)], 10)
+    >>> prim_mst({"a": {"b": 2}, "b": {"a": 2}}, strategy="array").edges()
+    [('a', 'b', 2)]
+    >>> prim_mst(graph, strategy="fibonacci")
+    Traceback (most recent call last):
+        ...
+    ValueError: unknown strategy 'fibonacci', expected one of lazy, indexed, array
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(
+            f"unknown strategy {strategy!r}, expected one of {', '.join(STRATEGIES)}"
+        )
+    csr = _as_csr(graph)
+    n = len(csr)
+    key: list[Any] = [inf] * n
+    parent = array("l", [-1]) * n
+    order: list[int] = []
+    if n == 0:
+        return SpanningTree(csr, order, parent, key)
+    start = 0
+    if root is not None:
+        start = root if csr.vertex_id is None else csr.vertex_id[root]
+    roots = [start, *range(n)]
+    grow = {"lazy": _grow_lazy, "indexed": _grow_indexed, "array": _grow_array}
+    grow[strategy](csr, roots, key, parent, order, arity)
+    return SpanningTree(csr, order, parent, key)
+
+
+def _grow_lazy(
+    csr: CSRGraph, roots: list[int], key: list, parent: array, order: list, _: int
+) -> None:
+    in_tree = bytearray(len(csr))
+    indices, weights = csr.neighbors, csr.neighbor_weights
+    for root in roots:
+        if in_tree[root]:
+            continue
+        key[root] = 0
+        heap = [(0, root)]
+        while heap:
+            _, u = heappop(heap)
+            if in_tree[u]:
+                continue  # a stale entry, u was reached by a cheaper edge
+            in_tree[u] = 1
+            order.append(u)
+            for v, weight in zip(indices(u), weights(u)):
+                if weight < key[v] and not in_tree[v]:
+                    key[v] = weight
+                    parent[v] = u
+                    heappush(heap, (weight, v))
+
+
+def _grow_indexed(
+    csr: CSRGraph, roots: list[int], key: list, parent: array, order: list, arity: int
+) -> None:
+    in_tree = bytearray(len(csr))
+    indices, weights = csr.neighbors, csr.neighbor_weights
+    heap = IndexedDaryHeap(len(csr), arity)
+    pop, push_or_decrease = heap.pop, heap.push_or_decrease
+    for root in roots:
+        if in_tree[root]:
+            continue
+        key[root] = 0
+        heap.push(root, 0)
+        while heap:
+            u, _ = pop()
+            in_tree[u] = 1
+            order.append(u)
+            for v, weight in zip(indices(u), weights(u)):
+                if weight < key[v] and not in_tree[v]:
+                    key[v] = weight
+                    parent[v] = u
+                    push_or_decrease(v, weight)
+
+
+def _grow_array(
+    csr: CSRGraph, roots: list[int], key: list, parent: array, order: list, _: int
+) -> None:
+    n = len(csr)
+    indices, weights = csr.neighbors, csr.neighbor_weights
+    # candidate[v] is key[v] while v is outside the tree and inf once it joins, so
+    # min() over the list is a C-level scan for the next vertex.
+    candidate = [inf] * n
+    in_tree = bytearray(n)
+    next_root = iter(roots)
+    for _ in range(n):
+        cheapest = min(candidate)
+        if cheapest == inf:
+            # nothing left is reachable: start the next component
+            u = next(r for r in next_root if not in_tree[r])
+            key[u] = 0
+        else:
+            u = candidate.index(cheapest)
+        candidate[u] = inf
+        in_tree[u] = 1
+        order.append(u)
+        for v, weight in zip(indices(u), weights(u)):
+            if weight < key[v] and not in_tree[v]:
+                key[v] = candidate[v] = weight
+                parent[v] = u
+
+
+def _random_graph(
+    num_vertices: int, num_edges: int, seed: int
+) -> list[tuple[int, int, int]]:
+    rng = random.Random(seed)
+    edges = [(v - 1, v, rng.randint(1, 1000)) for v in range(1, num_vertices)]
+    edges += [
+        (rng.randrange(num_vertices), rng.randrange(num_vertices), rng.randint(1, 1000))
+        for _ in range(num_edges - len(edges))
+    ]
+    return [(u, v, w) for u, v, w in edges if u != v]
+
+
+def benchmark(num_vertices: int = 2000, seed: int = 0) -> dict[str, dict[str, float]]:
+    """
+    Seconds taken by each strategy on a sparse graph (4 edges per vertex) and a
+    dense one (about half of all vertex pairs), after checking that every strategy
+    and minimum_spanning_tree_kruskal.kruskal agree on the total weight.
+
+    >>> timings = benchmark(60)
+    >>> sorted(timings), sorted(timings["dense"])
+    (['dense', 'sparse'], ['array', 'indexed', 'lazy'])
+    """
+    from graphs.minimum_spanning_tree_kruskal import kruskal
+
+    sizes = {
+        "sparse": 4 * num_vertices,
+        "dense": num_vertices * (num_vertices - 1) // 4,
+    }
+    timings = {}
+    for name, num_edges in sizes.items():
+        edges = _random_graph(num_vertices, num_edges, seed)
+        csr = CSRGraph.from_edges(
+            num_vertices, edges, directed=False, weighted=True
+        )
+        expected = sum(w for *_, w in kruskal(num_vertices, edges))
+        timings[name] = {}
+        for strategy in STRATEGIES:
+            assert prim_mst(csr, strategy=strategy).total_weight == expected, strategy
+            timings[name][strategy] = timeit(
+                lambda csr=csr, strategy=strategy: prim_mst(csr, strategy=strategy),
+                number=1,
+            )
+    return timings
@@ -0,0 +1,213 @@
+"""
+Single source shortest paths for small integer edge weights without a heap.
+
+https://codeforces.com/blog/entry/22276 (0-1 BFS)
+https://en.wikipedia.org/wiki/Dijkstra%27s_algorithm#Specialized_variants (Dial)
+
+breadth_first_search_zero_one_shortest_path.py stores one Edge dataclass per edge
+and answers one start/finish pair at a time.  The functions here run on the packed
+arrays of a ``csr_graph.CSRGraph`` and return a
+``dijkstra_binary_heap.ShortestPaths`` holding the whole distance and parent
+arrays, or stop as soon as ``target`` is settled:
+
+* ``zero_one_bfs`` for weights 0 and 1: a deque where 0-edges push to the front
+  and 1-edges to the back.  O(V + E).
+* ``dial`` for weights 0 .. C: a ring of C + 1 bucket lists indexed by distance
+  modulo C + 1.  O(V * C + E).
+
+Both beat the binary heap Dijkstra of ``dijkstra_binary_heap`` because queue
+operations are O(1) list and deque calls; see ``benchmark``.
+
+>>> graph = CSRGraph.from_edges(
+...     5, [(0, 1, 0), (0, 2, 1), (1, 2, 1), (2, 3, 0), (1, 3, 1)]
+... )
+>>> zero_one_bfs(graph, 0).distance
+[0, 0, 1, 1, inf]
+>>> dial(graph, 0).distance == zero_one_bfs(graph, 0).distance
+True
+"""
+from __future__ import annotations
+
+import random
+from array import array
+from collections import deque
+from collections.abc import Hashable
+from math import inf
+from timeit import timeit
+from typing import Any
+
+from graphs.csr_graph import CSRGraph
+from graphs.dijkstra_binary_heap import ShortestPaths, shortest_paths
+
+
+def _check_weights(csr: CSRGraph, max_weight: int) -> None:
+    """
+    >>> _check_weights(CSRGraph.from_edges(2, [(0, 1, 0.5), (1, 0, 0.25)]), 1)
+    Traceback (most recent call last):
+        ...
+    ValueError: the graph needs integer edge weights
+    """
+    if csr.weights is None or csr.weights.typecode in "fd":
+        raise ValueError("the graph needs integer edge weights")
+    if csr.weights and (min(csr.weights) < 0 or max(csr.weights) > max_weight):
+        raise ValueError(f"edge weights must be integers in 0..{max_weight}")
+
+
+def _vertex_id(csr: CSRGraph, vertex: Hashable | None) -> int:
+    if vertex is None:
+        return -1
+    return vertex if csr.vertex_id is None else csr.vertex_id[vertex]  # type: ignore
+
+
+def zero_one_bfs(
+    graph: CSRGraph, source: Hashable, target: Hashable | None = None
+) -> ShortestPaths:
+    """
+    >>> graph = CSRGraph.from_edges(
+    ...     4, [(0, 1, 1), (0, 2, 0), (2, 1, 0), (1, 3, 1)]
+    ... )
+    >>> paths = zero_one_bfs(graph, 0)
+    >>> paths.distance, paths.path_to(3)
+    ([0, 0, 0, 1], [0, 2, 1, 3])
+    >>> zero_one_bfs(graph, 0, target=2).distance
+    [0, 1, 0, inf]
+    >>> zero_one_bfs(CSRGraph.from_edges(2, [(0, 1, 2)]), 0)
+    Traceback (most recent call last):
+        ...
+    ValueError: edge weights must be integers in 0..1
+    >>> zero_one_bfs(CSRGraph.from_edges(3, [(0, 1, 0.5), (1, 2, 0.6)]), 0)
+    Traceback (most recent call last):
+        ...
+    ValueError: the graph needs integer edge weights
+    """
+    _check_weights(graph, 1)
+    n = len(graph)
+    start, goal = _vertex_id(graph, source), _vertex_id(graph, target)
+    distance: list[Any] = [inf] * n
+    parent = array("l", [-1]) * n
+    settled = bytearray(n)
+    indices, weights = graph.neighbors, graph.neighbor_weights
+    distance[start] = 0
+    queue = deque([start])
+    push_front, push_back, pop = queue.appendleft, queue.append, queue.popleft
+    while queue:
+        u = pop()
+        if settled[u]:
+            continue  # queued again after a 0-edge improved it
+        settled[u] = 1
+        if u == goal:
+            break
+        dist_u = distance[u]
+        for v, weight in zip(indices(u), weights(u)):
+            candidate = dist_u + weight
+            if candidate < distance[v]:
+                distance[v] = candidate
+                parent[v] = u
+                if weight:
+                    push_back(v)
+                else:
+                    push_front(v)
+    return ShortestPaths(graph, distance, parent)
+
+
+def dial(
+    graph: CSRGraph,
+    source: Hashable,
+    target: Hashable | None = None,
+    max_weight: int | None = None,
+) -> ShortestPaths:
+    """
+    Dial's algorithm: Dijkstra with a bucket queue.  Every tentative distance lies
+    within max_weight of the distance being settled, so max_weight + 1 buckets
+    reused round-robin are enough.  max_weight defaults to the largest weight.
+
+    >>> graph = CSRGraph.from_edges(
+    ...     5, [(0, 1, 7), (0, 2, 2), (2, 1, 3), (1, 3, 1), (2, 3, 9), (3, 4, 0)]
+    ... )
+    >>> paths = dial(graph, 0)
+    >>> paths.distance, paths.path_to(4)
+    ([0, 5, 2, 6, 6], [0, 2, 1, 3, 4])
+    >>> dial(graph, 0, target=1).distance
+    [0, 5, 2, 11, inf]
+    >>> dial(graph, 0, max_weight=5)
+    Traceback (most recent call last):
+        ...
+    ValueError: edge weights must be integers in 0..5
+    """
+    if max_weight is None:
+        max_weight = max(graph.weights) if graph.weights else 0
+    _check_weights(graph, max_weight)
+    n = len(graph)
+    start, goal = _vertex_id(graph, source), _vertex_id(graph, target)
+    distance: list[Any] = [inf] * n
+    parent = array("l", [-1]) * n
+    indices, weights = graph.neighbors, graph.neighbor_weights
+    num_buckets = max_weight + 1
+    buckets: list[list[int]] = [[] for _ in range(num_buckets)]
+    distance[start] = 0
+    buckets[0].append(start)
+    pending = 1  # entries in all buckets, stale ones included
+    current = 0
+    while pending:
+        bucket = buckets[current % num_buckets]
+        while bucket:
+            u = bucket.pop()
+            pending -= 1
+            if distance[u] != current:
+                continue  # stale entry, u was settled at a smaller distance
+            if u == goal:
+                return ShortestPaths(graph, distance, parent)
+            for v, weight in zip(indices(u), weights(u)):
+                candidate = current + weight
+                if candidate < distance[v]:
+                    distance[v] = candidate
+                    parent[v] = u
+                    buckets[candidate % num_buckets].append(v)
+                    pending += 1
+        current += 1
+    return ShortestPaths(graph, distance, parent)
+
+
+def grid_graph(rows: int, columns: int, max_weight: int, seed: int = 0) -> CSRGraph:
+    """
+    A rows x columns 4-connected grid with random weights in 0..max_weight on
+    every directed edge; vertex r * columns + c is the cell (r, c).
+
+    >>> grid = grid_graph(3, 4, 1)
+    >>> len(grid), grid.num_arcs
+    (12, 34)
+    """
+    rng = random.Random(seed)
+    edges = []
+    for r in range(rows):
+        for c in range(columns):
+            cell = r * columns + c
+            if c + 1 < columns:
+                edges.append((cell, cell + 1, rng.randint(0, max_weight)))
+                edges.append((cell + 1, cell, rng.randint(0, max_weight)))
+            if r + 1 < rows:
+                edges.append((cell, cell + columns, rng.randint(0, max_weight)))
+                edges.append((cell + columns, cell, rng.randint(0, max_weight)))
+    return CSRGraph.from_edges(rows * columns, edges, weighted=True)
+
+
+def benchmark(side: int = 200, max_weight: int = 9) -> dict[str, float]:
+    """
+    Seconds for a full single source run on side x side grids: 0-1 BFS and heap
+    Dijkstra on 0/1 weights, Dial and heap Dijkstra on weights 0..max_weight.
+    Raises AssertionError if any variant disagrees on the distances.
+
+    >>> sorted(benchmark(side=10))
+    ['dial', 'dijkstra 0-1', 'dijkstra 0..C', 'zero_one_bfs']
+    """
+    zero_one = grid_graph(side, side, 1)
+    small = grid_graph(side, side, max_weight)
+    assert zero_one_bfs(zero_one, 0).distance == shortest_paths(zero_one, [0]).distance
+    assert dial(small, 0).distance == shortest_paths(small, [0]).distance
+    variants = {
+        "zero_one_bfs": lambda: zero_one_bfs(zero_one, 0),
+        "dijkstra 0-1": lambda: shortest_paths(zero_one, [0]),
+        "dial": lambda: dial(small, 0),
+        "dijkstra 0..C": lambda: shortest_paths(small, [0]),
+    }
+    return {name: timeit(run, number=1) for name, run in variants.items()}
@@ -0,0 +1,184 @@
+"""
+Topological sorting of a directed acyclic graph with Kahn's algorithm, for
+scheduling tasks with dependencies.
+
+https://en.wikipedia.org/wiki/Topological_sorting#Kahn's_algorithm
+https://en.wikipedia.org/wiki/Critical_path_method
+
+kahns_algorithm_topo.py and kahns_algorithm_long.py print their answer.  The
+functions here return the order, the levels (groups of tasks that can run at the
+same time) and the critical path instead, and raise CycleError naming one cycle
+when the graph is not acyclic.  The list being built doubles as the FIFO queue (a
+read index walks along it), so every vertex and edge is handled once: O(V + E).
+
+The graph maps every vertex 0 .. n - 1 to the vertices that depend on it: a dict
+of lists, a list of lists or a csr_graph.CSRGraph.
+
+>>> chain = [[v + 1] for v in range(999_999)] + [[]]
+>>> len(topological_order(chain)), len(topological_levels(chain))
+(1000000, 1000000)
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import Any
+
+Graph = Any  # dict[int, list[int]], list[list[int]] or CSRGraph
+
+
+class CycleError(ValueError):
+    """Raised for a graph with a cycle; cycle lists its vertices in edge order."""
+
+    def __init__(self, cycle: list[int]) -> None:
+        self.cycle = cycle
+        path = " -> ".join(map(str, [*cycle, cycle[0]]))
+        super().__init__(f"graph contains a cycle: {path}")
+
+
+def _kahn(graph: Graph) -> tuple[list[int], list[int]]:
+    """
+    Kahn's algorithm in the same order as kahns_algorithm_topo.  Returns the
+    vertices it could order and the in-degrees left over, which are non-zero only
+    for vertices on or behind a cycle.
+    """
+    n = len(graph)
+    indegree = [0] * n
+    for vertex in range(n):
+        for successor in graph[vertex]:
+            indegree[successor] += 1
+    order = [vertex for vertex in range(n) if indegree[vertex] == 0]
+    head = 0
+    while head < len(order):
+        vertex = order[head]
+        head += 1
+        for successor in graph[vertex]:
+            indegree[successor] -= 1
+            if indegree[successor] == 0:
+                order.append(successor)
+    return order, indegree
+
+
+def find_cycle(graph: Graph) -> list[int] | None:
+    """
+    One cycle of the graph as a list of vertices in edge order, or None for a DAG.
+
+    Every vertex Kahn's algorithm cannot order has an unordered predecessor, so
+    walking predecessors from any of them must come back to a vertex already seen.
+
+    >>> find_cycle({0: [1], 1: [2], 2: [3], 3: [1, 4], 4: []})
+    [1, 2, 3]
+    >>> find_cycle({0: [0]})
+    [0]
+    >>> find_cycle({0: [1], 1: []}) is None
+    True
+    """
+    order, indegree = _kahn(graph)
+    if len(order) == len(graph):
+        return None
+    return _cycle_behind(graph, indegree)
+
+
+def _cycle_behind(graph: Graph, indegree: list[int]) -> list[int]:
+    predecessor = [-1] * len(graph)
+    for vertex in range(len(graph)):
+        if indegree[vertex]:
+            for successor in graph[vertex]:
+                if indegree[successor]:
+                    predecessor[successor] = vertex
+    step = [-1] * len(graph)  # position of each vertex on the backwards walk
+    walk: list[int] = []
+    vertex = next(v for v in range(len(graph)) if indegree[v])
+    while step[vertex] == -1:
+        step[vertex] = len(walk)
+        walk.append(vertex)
+        vertex = predecessor[vertex]
+    cycle = walk[step[vertex] :][::-1]
+    # start the cycle at its smallest vertex so the answer is easy to read
+    start = cycle.index(min(cycle))
+    return cycle[start:] + cycle[:start]
+
+
+def topological_order(graph: Graph) -> list[int]:
+    """
+    Vertices in an order where every edge points forward; the order printed by
+    kahns_algorithm_topo.topological_sort.
+
+    >>> graph = {0: [1, 2], 1: [3], 2: [3], 3: [4, 5], 4: [], 5: []}
+    >>> topological_order(graph)
+    [0, 1, 2, 3, 4, 5]
+    >>> try:
+    ...     topological_order({0: [1], 1: [2], 2: [0], 3: [0]})
+    ... except CycleError as error:
+    ...     print(error, error.cycle)
+    graph contains a cycle: 0 -> 1 -> 2 -> 0 [0, 1, 2]
+    """
+    order, indegree = _kahn(graph)
+    if len(order) != len(graph):
+        raise CycleError(_cycle_behind(graph, indegree))
+    return order
+
+
+def topological_levels(graph: Graph) -> list[list[int]]:
+    """
+    Vertices grouped by the length of the longest dependency chain leading to them.
+    The vertices of one level do not depend on each other, so each level can run in
+    parallel once the previous levels are done; the number of levels is the length
+    of the longest path counted in vertices, as in kahns_algorithm_long.
+
+    >>> graph = {0: [2, 3, 4], 1: [2, 7], 2: [5], 3: [5, 7], 4: [7], 5: [6],
+    ...          6: [7], 7: []}
+    >>> topological_levels(graph)
+    [[0, 1], [3, 4, 2], [5], [6], [7]]
+    """
+    level = [0] * len(graph)
+    levels: list[list[int]] = []
+    for vertex in topological_order(graph):
+        depth = level[vertex]
+        if depth == len(levels):
+            levels.append([])
+        levels[depth].append(vertex)
+        for successor in graph[vertex]:
+            if level[successor] <= depth:
+                level[successor] = depth + 1
+    return levels
+
+
+def critical_path(
+    graph: Graph, durations: Sequence[float] | None = None
+) -> tuple[float, list[int]]:
+    """
+    Length and vertices of the critical path: the chain of dependent tasks with the
+    largest total duration, which bounds the time to run the whole graph however
+    many tasks run in parallel.  Every task takes 1 unit unless durations says
+    otherwise.
+
+    >>> graph = {0: [2, 3, 4], 1: [2, 7], 2: [5], 3: [5, 7], 4: [7], 5: [6],
+    ...          6: [7], 7: []}
+    >>> critical_path(graph)
+    (5, [0, 3, 5, 6, 7])
+    >>> critical_path(graph, [3, 1, 2, 9, 4, 1, 1, 2])
+    (16, [0, 3, 5, 6, 7])
+    >>> critical_path({})
+    (0, [])
+    """
+    n = len(graph)
+    if durations is None:
+        durations = [1] * n
+    finish = [0] * n  # earliest time each task can finish
+    start = [0] * n
+    parent = [-1] * n
+    for vertex in topological_order(graph):
+        done = finish[vertex] = start[vertex] + durations[vertex]
+        for successor in graph[vertex]:
+            if done > start[successor]:
+                start[successor] = done
+                parent[successor] = vertex
+    if n == 0:
+        return 0, []
+    vertex = max(range(n), key=finish.__getitem__)
+    length = finish[vertex]
+    path = []
+    while vertex != -1:
+        path.append(vertex)
+        vertex = parent[vertex]
+    return length, path[::-1]